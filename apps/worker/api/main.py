@@ -1,12 +1,18 @@
+import asyncio
 import uuid
-from datetime import datetime
+from functools import partial
 from typing import Any, Dict, List, Optional
 
-from fastapi import BackgroundTasks, FastAPI
+from core.config import TRANSCRIPTION_MODE, WARMUP_MODELS
+from fastapi import FastAPI, HTTPException
+from processor.helpers.audio_utils import resolve_transcription_profile
+from processor.helpers.model_registry import registry, warmup_models
 from processor.logger import get_logger
 from processor.processor import process_interview
+from processor.question_pool import start_question_pool
 from pydantic import BaseModel
-from services.job_service import submit_processing_job
+from services.job_queue import JobQueueFull, scheduler
+from services.result_cache import result_cache
 
 logger = get_logger("interview-api")
 
@@ -26,12 +32,55 @@ class InterviewRequest(BaseModel):
     status_callback_url: Optional[str] = None
     task_status_callback_url: Optional[str] = None
     worker_status_callback_url: Optional[str] = None
+    # Per-job processing options, e.g. {"transcriptionMode": "single_pass",
+    # "whisperProfile": "fast", "whisper": {"beamSize": 1}}
+    options: Dict[str, Any] = {}
+    # Higher runs first; equal priorities run in submission order
+    priority: int = 0
 
 
 class InterviewResponse(BaseModel):
     interview_id: str
     status: str
     submitted_at: str
+    queue_position: Optional[int] = None
+
+
+class JobStatusResponse(BaseModel):
+    interview_id: str
+    status: str
+    priority: int
+    submitted_at: str
+    started_at: Optional[str] = None
+    finished_at: Optional[str] = None
+    error: Optional[str] = None
+    queue_position: Optional[int] = None
+    queue_length: int
+    running_jobs: int
+
+
+@app.on_event("startup")
+async def load_models():
+    if WARMUP_MODELS:
+        # Load in the background so health checks answer while models warm up
+        loop = asyncio.get_running_loop()
+        # Pool workers warm up their own models; the API process then only
+        # needs Whisper if it transcribes whole interviews itself
+        pooled = await loop.run_in_executor(None, start_question_pool)
+        if not pooled:
+            loop.run_in_executor(None, warmup_models)
+        elif TRANSCRIPTION_MODE != "per_question":
+            loop.run_in_executor(None, partial(warmup_models, vision=False))
+
+
+@app.on_event("startup")
+async def start_scheduler():
+    await scheduler.start()
+
+
+@app.on_event("shutdown")
+async def stop_scheduler():
+    await scheduler.stop()
 
 
 @app.get("/")
@@ -39,24 +88,51 @@ def read_root():
     return {"status": "running"}
 
 
+@app.get("/metrics/models")
+def model_metrics():
+    return registry.metrics()
+
+
+@app.get("/metrics/result-cache")
+def result_cache_metrics():
+    if result_cache is None:
+        return {"enabled": False}
+    return result_cache.metrics()
+
+
 @app.post("/process-interview", response_model=InterviewResponse)
 # @app.post("/process-interview")
-async def create_processing_job(
-    request: InterviewRequest, background_tasks: BackgroundTasks
-):
-    submitted_at = datetime.now().isoformat()
-
-    background_tasks.add_task(
-        submit_processing_job,
-        request.interview_id,
-        request.video_url,
-        request.timestamps,
-        request.questions,
-        request.callback_url,
-        request.status_callback_url,
-        request.task_status_callback_url,
-        request.worker_status_callback_url,
-    )
+async def create_processing_job(request: InterviewRequest):
+    if not scheduler.running:
+        raise HTTPException(status_code=503, detail="Job scheduler is not running")
+
+    # Reject bad transcription options now rather than failing the queued job
+    try:
+        resolve_transcription_profile(request.options)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+    try:
+        job = scheduler.submit(
+            request.interview_id,
+            {
+                "interview_id": request.interview_id,
+                "video_url": request.video_url,
+                "timestamps": request.timestamps,
+                "questions": request.questions,
+                "callback_url": request.callback_url,
+                "status_callback_url": request.status_callback_url,
+                "task_status_callback_url": request.task_status_callback_url,
+                "worker_status_callback_url": request.worker_status_callback_url,
+                "options": request.options,
+            },
+            priority=request.priority,
+        )
+    except JobQueueFull as e:
+        logger.error(f"Rejected job {request.interview_id}: {str(e)}")
+        raise HTTPException(
+            status_code=429, detail=str(e), headers={"Retry-After": "60"}
+        )
 
     # result = process_interview(job_id, {
     #     "videoUrl": request.video_url,
@@ -75,5 +151,14 @@ async def create_processing_job(
     return InterviewResponse(
         interview_id=request.interview_id,
         status="submitted",
-        submitted_at=submitted_at,
+        submitted_at=job["submitted_at"],
+        queue_position=job["queue_position"],
     )
+
+
+@app.get("/jobs/{interview_id}", response_model=JobStatusResponse)
+def get_job_status(interview_id: str):
+    job = scheduler.status(interview_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return JobStatusResponse(**job)
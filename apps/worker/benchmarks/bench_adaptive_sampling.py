@@ -0,0 +1,47 @@
+"""Fixed vs adaptive frame sampling: frames analyzed and emotion timeline drift
+
+For every second of video the adaptive timeline is read as the emotion of the
+last sample at or before it, and compared with the fixed one-per-second one.
+
+Usage (from apps/worker):
+    python -m benchmarks.bench_adaptive_sampling video.mp4 [budget]
+"""
+
+import bisect
+import sys
+import time
+
+from processor.helpers import vision_utils
+from processor.helpers.frame_sampler import sample_frames
+
+
+def timeline(video_path: str, sampling: str, budget: int):
+    analyzer = vision_utils.EmotionAnalyzer(with_timeline=True)
+    start = time.perf_counter()
+    for sample in sample_frames(video_path, sampling=sampling, budget=budget):
+        analyzer.process(sample)
+    result = analyzer.result()
+    return time.perf_counter() - start, analyzer.frames, result["timeline"]
+
+
+def main():
+    video_path = sys.argv[1]
+    budget = int(sys.argv[2]) if len(sys.argv) > 2 else 0
+
+    fixed_s, fixed_frames, fixed = timeline(video_path, "fixed", 0)
+    adaptive_s, adaptive_frames, adaptive = timeline(video_path, "adaptive", budget)
+
+    times = [e["timestamp"] for e in adaptive]
+    same = 0
+    for entry in fixed:
+        i = bisect.bisect_right(times, entry["timestamp"] + 1e-6) - 1
+        if i >= 0 and adaptive[i]["emotion"] == entry["emotion"]:
+            same += 1
+
+    print(f"fixed     {fixed_s:7.2f}s frames={fixed_frames}")
+    print(f"adaptive  {adaptive_s:7.2f}s frames={adaptive_frames} budget={budget}")
+    print(f"timeline agreement {same}/{len(fixed)}")
+
+
+if __name__ == "__main__":
+    main()
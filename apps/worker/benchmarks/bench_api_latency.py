@@ -0,0 +1,51 @@
+"""Latency of GET / while an interview is being processed
+
+Submits a job to a running worker, then hits / every 100 ms until the job
+finishes and prints latency percentiles. With the pipeline on the event loop
+the health check stalls for the whole job; it should now stay in milliseconds.
+
+Usage (from apps/worker, with the API running):
+    python -m benchmarks.bench_api_latency http://localhost:7860 payload.json
+"""
+
+import json
+import statistics
+import sys
+import time
+
+import httpx
+
+
+def main():
+    base_url = sys.argv[1].rstrip("/")
+    with open(sys.argv[2]) as f:
+        payload = json.load(f)
+    max_ms = float(sys.argv[3]) if len(sys.argv) > 3 else 500.0
+
+    with httpx.Client(timeout=30.0) as client:
+        client.post(f"{base_url}/process-interview", json=payload).raise_for_status()
+        interview_id = payload["interview_id"]
+
+        latencies = []
+        while True:
+            start = time.perf_counter()
+            client.get(f"{base_url}/").raise_for_status()
+            latencies.append((time.perf_counter() - start) * 1000)
+
+            job = client.get(f"{base_url}/jobs/{interview_id}").json()
+            if job.get("status") in ("completed", "failed"):
+                break
+            time.sleep(0.1)
+
+    latencies.sort()
+    p95 = latencies[int(0.95 * (len(latencies) - 1))]
+    print(
+        f"requests={len(latencies)} p50={statistics.median(latencies):.1f}ms "
+        f"p95={p95:.1f}ms max={latencies[-1]:.1f}ms (job {job['status']})"
+    )
+    if latencies[-1] > max_ms:
+        raise SystemExit(f"FAIL: / took {latencies[-1]:.0f}ms, limit {max_ms:.0f}ms")
+
+
+if __name__ == "__main__":
+    main()
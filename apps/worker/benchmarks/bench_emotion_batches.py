@@ -0,0 +1,73 @@
+"""Emotion analysis throughput per batch size, and agreement with batch size 1
+
+The last row repeats the largest batch size with face tracking enabled.
+
+Usage (from apps/worker):
+    python -m benchmarks.bench_emotion_batches path/to/video.mp4 [max_frames] [sizes]
+
+sizes is a comma separated list of batch sizes (default 1,4,8,16,32).
+"""
+
+import sys
+
+from processor.helpers import vision_utils
+from processor.helpers.frame_sampler import sample_frames
+
+
+def run(frames, batch_size, tracking=False):
+    analyzer = vision_utils.EmotionAnalyzer(
+        with_timeline=True, batch_size=batch_size, tracking=tracking
+    )
+    for sample in frames:
+        analyzer.process(sample)
+    return analyzer.result(), analyzer
+
+
+def main():
+    video_path = sys.argv[1]
+    max_frames = int(sys.argv[2]) if len(sys.argv) > 2 else 60
+    sizes = [
+        int(s) for s in (sys.argv[3] if len(sys.argv) > 3 else "1,4,8,16,32").split(",")
+    ]
+
+    frames = []
+    for sample in sample_frames(video_path):
+        frames.append(sample)
+        if len(frames) >= max_frames:
+            break
+    if not frames:
+        raise SystemExit(f"No frames decoded from {video_path}")
+
+    # Warm up detector and both inference paths so no size pays the load
+    run(frames[:2], 1)
+    run(frames[:2], 2)
+
+    baseline = None
+    runs = [(size, False) for size in sizes] + [(max(sizes), True)]
+    for size, tracking in runs:
+        result, analyzer = run(frames, size, tracking)
+        line = (
+            f"batch={size:<3} frames={analyzer.frames} batches={analyzer.batches} "
+            f"fps={result['throughput_fps']:.2f} "
+            f"dominant={result['dominant_emotion']}"
+        )
+        if tracking:
+            detection = result["face_detection"]
+            line += (
+                f" tracked detector_calls={detection['detector_calls']} "
+                f"locate_speedup={detection['speedup']:.2f}x"
+            )
+        if baseline is None:
+            baseline = {e["timestamp"]: e["emotion"] for e in result["timeline"]}
+        else:
+            same = sum(
+                1
+                for e in result["timeline"]
+                if baseline.get(e["timestamp"]) == e["emotion"]
+            )
+            line += f" agreement={same}/{len(result['timeline'])}"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
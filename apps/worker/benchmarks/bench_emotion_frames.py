@@ -0,0 +1,83 @@
+"""Per-frame latency of DeepFace emotion analysis: temp JPEG vs in-memory frame
+
+Usage (from apps/worker):
+    python -m benchmarks.bench_emotion_frames path/to/video.mp4 [max_frames]
+"""
+
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+import cv2
+from deepface import DeepFace
+
+from processor.helpers.frame_sampler import sample_frames
+
+
+def analyze_via_jpeg(frame):
+    with tempfile.NamedTemporaryFile(suffix=".jpg", delete=False) as temp_file:
+        frame_path = temp_file.name
+        cv2.imwrite(frame_path, frame)
+    try:
+        return DeepFace.analyze(
+            img_path=frame_path,
+            actions=["emotion"],
+            enforce_detection=False,
+            detector_backend="mediapipe",
+        )
+    finally:
+        os.unlink(frame_path)
+
+
+def analyze_in_memory(frame):
+    return DeepFace.analyze(
+        img_path=frame,
+        actions=["emotion"],
+        enforce_detection=False,
+        detector_backend="mediapipe",
+    )
+
+
+def summarize(name, latencies_ms):
+    latencies_ms = sorted(latencies_ms)
+    p95 = latencies_ms[int(0.95 * (len(latencies_ms) - 1))]
+    print(
+        f"{name:<10} frames={len(latencies_ms)} "
+        f"mean={statistics.mean(latencies_ms):.1f}ms "
+        f"p50={statistics.median(latencies_ms):.1f}ms p95={p95:.1f}ms"
+    )
+
+
+def main():
+    video_path = sys.argv[1]
+    max_frames = int(sys.argv[2]) if len(sys.argv) > 2 else 60
+
+    frames = []
+    for sample in sample_frames(video_path):
+        frames.append(sample.image)
+        if len(frames) >= max_frames:
+            break
+    if not frames:
+        raise SystemExit(f"No frames decoded from {video_path}")
+
+    # Warm up detector and emotion model so neither side pays the load
+    analyze_in_memory(frames[0])
+
+    results = {}
+    for name, fn in (("jpeg", analyze_via_jpeg), ("in-memory", analyze_in_memory)):
+        latencies = []
+        for frame in frames:
+            start = time.perf_counter()
+            fn(frame)
+            latencies.append((time.perf_counter() - start) * 1000)
+        results[name] = latencies
+        summarize(name, latencies)
+
+    speedup = statistics.mean(results["jpeg"]) / statistics.mean(results["in-memory"])
+    print(f"speedup    {speedup:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
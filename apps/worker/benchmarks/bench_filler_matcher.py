@@ -0,0 +1,81 @@
+"""Filler detection on long transcripts: per-word regexes vs the token trie
+
+The regex version is the per-word matcher summarize_segments used before
+processor.helpers.fillers; it cannot see fillers spanning several words.
+
+Usage (from apps/worker):
+    python -m benchmarks.bench_filler_matcher [words] [repeats]
+"""
+
+import random
+import re
+import sys
+import time
+
+from processor.helpers.fillers import FillerMatcher
+
+FILLERS = ["um", "uh", "like", "you know"]
+VOCABULARY = (
+    "i think that the project was really about working with a team and we "
+    "had to ship it on time so you know we planned everything um carefully "
+    "uh and it was like a lot of work but i learned how to lead people"
+).split()
+
+
+def regex_scan(words):
+    filler_pattern = re.compile(
+        r"\b(" + "|".join(re.escape(fw) for fw in FILLERS) + r")\b",
+        re.IGNORECASE,
+    )
+    counts = {fw: 0 for fw in FILLERS}
+    disfluencies = []
+    for word_info in words:
+        word_lower = word_info["word"].lower()
+        if filler_pattern.search(word_lower):
+            for filler in FILLERS:
+                if re.search(r"\b" + re.escape(filler) + r"\b", word_lower, re.I):
+                    disfluencies.append(
+                        {"word": filler, "timestamp": word_info["start"]}
+                    )
+                    counts[filler] += 1
+                    break
+    return disfluencies, counts
+
+
+def transcript(n_words):
+    rng = random.Random(0)
+    words = []
+    for i in range(n_words):
+        token = rng.choice(VOCABULARY)
+        if rng.random() < 0.1:
+            token = token.capitalize() + ","
+        words.append({"word": " " + token, "start": i * 0.4, "end": i * 0.4 + 0.3})
+    return words
+
+
+def best_of(fn, words, repeats):
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = fn(words)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    n_words = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    words = transcript(n_words)
+    matcher = FillerMatcher(FILLERS)
+
+    regex_s, (_, regex_counts) = best_of(regex_scan, words, repeats)
+    trie_s, (_, trie_counts) = best_of(matcher.scan, words, repeats)
+
+    print(f"words={n_words}")
+    print(f"  regex {regex_s * 1000:8.1f}ms  {regex_counts}")
+    print(f"  trie  {trie_s * 1000:8.1f}ms  {trie_counts}")
+    print(f"  speedup {regex_s / trie_s:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
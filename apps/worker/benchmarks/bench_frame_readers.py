@@ -0,0 +1,40 @@
+"""Compare frame readers on recorded interviews to pick the FRAME_READER default
+
+Usage (from apps/worker):
+    python -m benchmarks.bench_frame_readers video1.webm [video2.webm ...]
+"""
+
+import sys
+import time
+
+from processor.helpers.frame_sampler import FRAME_READERS, sample_frames
+
+
+def bench(video_path: str, reader: str):
+    start = time.perf_counter()
+    indices = [sample.index for sample in sample_frames(video_path, reader)]
+    return time.perf_counter() - start, indices
+
+
+def main():
+    for video_path in sys.argv[1:]:
+        print(video_path)
+        baseline = None
+        for reader in FRAME_READERS:
+            try:
+                elapsed, indices = bench(video_path, reader)
+            except Exception as e:
+                print(f"  {reader:<7} failed: {e}")
+                continue
+            if baseline is None:
+                baseline = indices
+            same = "same frames" if indices == baseline else "DIFFERENT frames"
+            per_frame = elapsed * 1000 / len(indices) if indices else 0.0
+            print(
+                f"  {reader:<7} {elapsed:7.2f}s  frames={len(indices):<5} "
+                f"{per_frame:6.1f}ms/frame  {same}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""Vision latency and accuracy per inference resolution, against full resolution
+
+For each INFERENCE_MAX_SIDE value the same sampled frames go through the
+emotion and pose analyzers. Accuracy is the share of frames with the same
+dominant emotion as at full resolution, and the mean distance between
+normalized pose landmarks of frames where both resolutions found a pose.
+
+Usage (from apps/worker):
+    python -m benchmarks.bench_inference_resolution video.mp4 [max_frames] [sides]
+
+sides is a comma separated list of max sides (default 0,1280,960,640,480;
+0 is full resolution and the reference).
+"""
+
+import sys
+import time
+
+import numpy as np
+
+from processor.helpers import vision_utils
+from processor.helpers.frame_sampler import inference_frames, sample_frames
+from processor.helpers.model_registry import get_pose_pool
+
+
+def run(frames, max_side):
+    prepared = list(inference_frames(iter(frames), max_side))
+    prepare_ms = sum(p.decode_ms - f.decode_ms for p, f in zip(prepared, frames))
+
+    emotions = vision_utils.EmotionAnalyzer(with_timeline=True, tracking=False)
+    for sample in prepared:
+        emotions.process(sample)
+    dominant = {e["timestamp"]: e["emotion"] for e in emotions.result()["timeline"]}
+
+    pool = get_pose_pool()
+    model = pool.checkout()
+    landmarks = []
+    pose_start = time.perf_counter()
+    try:
+        for sample in prepared:
+            results = model.process(sample.rgb)
+            if results.pose_landmarks:
+                landmarks.append(
+                    np.array([(lm.x, lm.y) for lm in results.pose_landmarks.landmark])
+                )
+            else:
+                landmarks.append(None)
+    finally:
+        pool.checkin(model)
+    pose_ms = (time.perf_counter() - pose_start) * 1000
+
+    return {
+        "ms_per_frame": (prepare_ms + emotions.elapsed_ms + pose_ms) / len(frames),
+        "dominant": dominant,
+        "landmarks": landmarks,
+    }
+
+
+def main():
+    video_path = sys.argv[1]
+    max_frames = int(sys.argv[2]) if len(sys.argv) > 2 else 60
+    sides = [
+        int(s)
+        for s in (sys.argv[3] if len(sys.argv) > 3 else "0,1280,960,640,480").split(",")
+    ]
+
+    frames = []
+    for sample in sample_frames(video_path):
+        frames.append(sample)
+        if len(frames) >= max_frames:
+            break
+    if not frames:
+        raise SystemExit(f"No frames decoded from {video_path}")
+    height, width = frames[0].image.shape[:2]
+    print(f"{video_path}: {width}x{height}, {len(frames)} frames")
+
+    # Warm up the detector and models so the first size does not pay the load
+    run(frames[:2], 0)
+
+    reference = run(frames, 0)
+    for side in sides:
+        result = reference if side == 0 else run(frames, side)
+        same = sum(
+            1
+            for t, emotion in result["dominant"].items()
+            if reference["dominant"].get(t) == emotion
+        )
+        errors = [
+            np.linalg.norm(a - b, axis=1).mean()
+            for a, b in zip(result["landmarks"], reference["landmarks"])
+            if a is not None and b is not None
+        ]
+        landmark_error = f"{np.mean(errors):.4f}" if errors else "n/a"
+        speedup = reference["ms_per_frame"] / result["ms_per_frame"]
+        print(
+            f"  max_side={side or 'full':<5} {result['ms_per_frame']:7.1f}ms/frame "
+            f"{speedup:5.2f}x  emotion agreement={same}/{len(reference['dominant'])} "
+            f"landmark error={landmark_error}"
+        )
+
+
+if __name__ == "__main__":
+    main()
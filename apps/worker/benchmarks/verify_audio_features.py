@@ -0,0 +1,66 @@
+"""Check processor.helpers.audio_features against librosa and time both
+
+Compares the framed RMS and its standard deviation (volume_variation) on
+synthetic signals of awkward lengths and, if given, on real recordings decoded
+to 16 kHz float32 PCM (the files extract_audio writes). librosa is only needed
+to run this script, not by the worker.
+
+Usage (from apps/worker):
+    python -m benchmarks.verify_audio_features [audio.f32 ...]
+"""
+
+import sys
+import time
+
+import librosa
+import numpy as np
+
+from processor.helpers.audio_features import frame_rms, volume_variation
+from processor.helpers.audio_utils import open_pcm
+
+# RMS is float32 in both implementations; librosa sums in float32
+RMS_TOLERANCE = 1e-6
+STD_TOLERANCE = 1e-6
+
+
+def check(name: str, y: np.ndarray) -> bool:
+    start = time.perf_counter()
+    expected = librosa.feature.rms(y=np.asarray(y, dtype=np.float32))[0]
+    librosa_ms = (time.perf_counter() - start) * 1000
+    expected_std = float(np.std(expected))
+
+    start = time.perf_counter()
+    actual = frame_rms(y)
+    ours_ms = (time.perf_counter() - start) * 1000
+    actual_std = volume_variation(y)
+
+    same_shape = expected.shape == actual.shape
+    rms_error = float(np.max(np.abs(expected - actual))) if same_shape else np.inf
+    std_error = abs(expected_std - actual_std)
+    ok = rms_error <= RMS_TOLERANCE and std_error <= STD_TOLERANCE
+    # The first librosa call includes numba JIT compilation (cold start)
+    print(
+        f"{'ok  ' if ok else 'FAIL'} {name:<32} frames={len(actual):<7} "
+        f"max rms error={rms_error:.2e} std error={std_error:.2e} "
+        f"librosa={librosa_ms:8.1f}ms ours={ours_ms:7.1f}ms"
+    )
+    return ok
+
+
+def main():
+    rng = np.random.default_rng(0)
+    signals = []
+    for n in (1, 511, 512, 2047, 2048, 48_123, 16_000 * 300 + 7):
+        envelope = 0.5 + 0.5 * np.sin(np.arange(n) / 4000)
+        noise = rng.standard_normal(n) * 0.1 * envelope
+        signals.append((f"synthetic {n} samples", noise.astype(np.float32)))
+    for path in sys.argv[1:]:
+        signals.append((path, open_pcm(path)))
+
+    results = [check(name, y) for name, y in signals]
+    if not all(results):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
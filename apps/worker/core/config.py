@@ -1,4 +1,152 @@
+import json
 import os
+import tempfile
 
 CHUNK_SAVE_DIR = os.path.join(os.path.dirname(__file__), "../chunks")
 os.makedirs(CHUNK_SAVE_DIR, exist_ok=True)
+
+# Whisper model loaded by default and warmed up at API startup
+WHISPER_MODEL_SIZE = os.getenv("WHISPER_MODEL_SIZE", "medium")
+WHISPER_COMPUTE_TYPE = os.getenv("WHISPER_COMPUTE_TYPE", "int8")
+WHISPER_DEVICE = os.getenv("WHISPER_DEVICE", "cpu")
+# Decoding defaults; 0 CPU threads lets CTranslate2 pick
+WHISPER_BEAM_SIZE = int(os.getenv("WHISPER_BEAM_SIZE", "5"))
+WHISPER_CPU_THREADS = int(os.getenv("WHISPER_CPU_THREADS", "0"))
+WHISPER_NUM_WORKERS = int(os.getenv("WHISPER_NUM_WORKERS", "1"))
+WHISPER_LANGUAGE = os.getenv("WHISPER_LANGUAGE", "en")
+# Named transcription profiles a job can pick with options.whisperProfile,
+# overriding the defaults above (JSON object of name -> settings)
+WHISPER_PROFILES = json.loads(
+    os.getenv(
+        "WHISPER_PROFILES",
+        json.dumps(
+            {
+                "fast": {"model_size": "base", "beam_size": 1},
+                "balanced": {"model_size": "small", "beam_size": 3},
+                "accurate": {"model_size": "medium", "beam_size": 5},
+            }
+        ),
+    )
+)
+# Profile used when a job does not name one; empty uses the defaults above
+WHISPER_PROFILE = os.getenv("WHISPER_PROFILE", "")
+WARMUP_MODELS = os.getenv("WARMUP_MODELS", "true").lower() == "true"
+
+# Model cache eviction: 0 disables the corresponding limit
+MODEL_MEMORY_LIMIT_MB = float(os.getenv("MODEL_MEMORY_LIMIT_MB", "0"))
+MODEL_IDLE_TTL_SECONDS = float(os.getenv("MODEL_IDLE_TTL_SECONDS", "0"))
+
+# "per_question" transcribes each sliced answer on its own; "single_pass"
+# transcribes the whole interview once and splits words by question window;
+# "batched" transcribes answers together in batches (see below)
+TRANSCRIPTION_MODE = os.getenv("TRANSCRIPTION_MODE", "per_question")
+
+# How sampled video frames are read: "seek", "grab", "ffmpeg" or "pyav" (see
+# processor/helpers/frame_sampler.py and benchmarks/bench_frame_readers.py)
+FRAME_READER = os.getenv("FRAME_READER", "grab")
+# Reader used for WebM/Matroska sources that were not transcoded to MP4
+WEBM_FRAME_READER = os.getenv("WEBM_FRAME_READER", "pyav")
+
+# Streaming download of recordings (processor/helpers/ingest.py)
+INGEST_CHUNK_SIZE = int(os.getenv("INGEST_CHUNK_SIZE", str(1024 * 1024)))
+INGEST_POOL_SIZE = int(os.getenv("INGEST_POOL_SIZE", "4"))
+INGEST_MAX_RETRIES = int(os.getenv("INGEST_MAX_RETRIES", "3"))
+INGEST_TIMEOUT_SECONDS = float(os.getenv("INGEST_TIMEOUT_SECONDS", "60"))
+
+# Writable state (job journal, caches); /app is read-only for the container user
+WORKER_DATA_DIR = os.getenv(
+    "WORKER_DATA_DIR", os.path.join(tempfile.gettempdir(), "intervuave-worker")
+)
+
+# In-process job scheduler (services/job_queue.py)
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "1"))
+JOB_QUEUE_SIZE = int(os.getenv("JOB_QUEUE_SIZE", "20"))
+JOB_JOURNAL_PATH = os.getenv(
+    "JOB_JOURNAL_PATH", os.path.join(WORKER_DATA_DIR, "jobs.sqlite3")
+)
+# Threads running blocking pipeline work; one per concurrently processed job
+PIPELINE_THREADS = int(os.getenv("PIPELINE_THREADS", str(JOB_WORKERS)))
+
+# Per-question process pool; 1 runs questions inline in the pipeline thread
+QUESTION_WORKERS = int(os.getenv("QUESTION_WORKERS", "1"))
+# Native threads per question worker; 0 splits the CPUs evenly between workers
+QUESTION_WORKER_THREADS = int(os.getenv("QUESTION_WORKER_THREADS", "0"))
+PIN_QUESTION_WORKERS = os.getenv("PIN_QUESTION_WORKERS", "false").lower() == "true"
+
+# MediaPipe graph for body language: "pose" (pose landmarks only) or "holistic"
+POSE_MODEL = os.getenv("POSE_MODEL", "pose")
+
+# Faces per emotion model forward pass; 1 runs DeepFace.analyze frame by frame.
+# Check agreement with benchmarks/bench_emotion_batches.py before raising it
+EMOTION_BATCH_SIZE = int(os.getenv("EMOTION_BATCH_SIZE", "1"))
+# Track the face box between emotion samples instead of detecting every frame.
+# Tracked crops are not aligned like detected ones; check agreement with
+# benchmarks/bench_emotion_batches.py before enabling it
+EMOTION_FACE_TRACKING = os.getenv("EMOTION_FACE_TRACKING", "false").lower() == "true"
+# Run the face detector at least every N samples while tracking
+FACE_REDETECT_INTERVAL = int(os.getenv("FACE_REDETECT_INTERVAL", "10"))
+# Template match score (TM_CCOEFF_NORMED) below which the face is re-detected
+FACE_TRACK_MIN_SCORE = float(os.getenv("FACE_TRACK_MIN_SCORE", "0.6"))
+
+# Frame sampling: "fixed" (one frame per second) or "adaptive" (sparse while
+# static, dense around movement; processor/helpers/frame_sampler.py)
+FRAME_SAMPLING = os.getenv("FRAME_SAMPLING", "fixed")
+# Spacing of candidate frames and longest gap between kept frames, in seconds
+ADAPTIVE_MIN_INTERVAL = float(os.getenv("ADAPTIVE_MIN_INTERVAL", "0.25"))
+ADAPTIVE_MAX_INTERVAL = float(os.getenv("ADAPTIVE_MAX_INTERVAL", "2.0"))
+# Mean absolute difference (0-255) of 64x36 grayscale thumbnails that counts
+# as movement
+ADAPTIVE_DIFF_THRESHOLD = float(os.getenv("ADAPTIVE_DIFF_THRESHOLD", "4.0"))
+# Most frames analyzed per job with adaptive sampling, split over questions by
+# answer length; 0 for no limit
+FRAME_BUDGET = int(os.getenv("FRAME_BUDGET", "0"))
+# Longer side, in pixels, frames are downscaled to before face/pose inference;
+# 0 analyzes frames at capture resolution. Compare accuracy and latency with
+# benchmarks/bench_inference_resolution.py before setting it
+INFERENCE_MAX_SIDE = int(os.getenv("INFERENCE_MAX_SIDE", "0"))
+
+# Batched transcription (TRANSCRIPTION_MODE "batched"): answers from all
+# questions and concurrent interviews in this process are concatenated and
+# transcribed together; a batch runs once it has TRANSCRIBE_MAX_CLIPS clips or
+# its oldest clip has waited TRANSCRIBE_MAX_WAIT_MS
+TRANSCRIBE_MAX_CLIPS = int(os.getenv("TRANSCRIBE_MAX_CLIPS", "16"))
+TRANSCRIBE_MAX_WAIT_MS = int(os.getenv("TRANSCRIBE_MAX_WAIT_MS", "500"))
+# Audio chunks per forward pass of the batched Whisper pipeline
+WHISPER_BATCH_SIZE = int(os.getenv("WHISPER_BATCH_SIZE", "8"))
+
+# Filler phrases counted as disfluencies, per transcription language (JSON
+# object of language -> phrases; phrases may be several words)
+FILLER_LEXICONS = json.loads(
+    os.getenv(
+        "FILLER_LEXICONS",
+        json.dumps(
+            {
+                "en": ["um", "uh", "like", "you know"],
+                "es": ["eh", "este", "pues", "o sea"],
+                "fr": ["euh", "ben", "genre", "tu vois"],
+                "de": ["äh", "ähm", "halt", "weißt du"],
+            }
+        ),
+    )
+)
+# Lexicon used when the language is auto-detected or has no lexicon
+FILLER_DEFAULT_LANGUAGE = os.getenv("FILLER_DEFAULT_LANGUAGE", "en")
+
+# Result cache for resubmitted interviews (services/result_cache.py), keyed on
+# the video's content hash or ETag, the question timestamps, the job options
+# and the processing version; 0 disables the corresponding limit
+RESULT_CACHE_ENABLED = os.getenv("RESULT_CACHE_ENABLED", "true").lower() == "true"
+RESULT_CACHE_DIR = os.getenv(
+    "RESULT_CACHE_DIR", os.path.join(WORKER_DATA_DIR, "result_cache")
+)
+RESULT_CACHE_MAX_MB = float(os.getenv("RESULT_CACHE_MAX_MB", "256"))
+RESULT_CACHE_MAX_AGE_SECONDS = float(
+    os.getenv("RESULT_CACHE_MAX_AGE_SECONDS", str(7 * 24 * 3600))
+)
+
+# Raw per-question analyzer outputs, kept so metrics can be recomputed with
+# `python -m processor.rescore` after changing processor/helpers/metrics.py
+FEATURE_STORE_ENABLED = os.getenv("FEATURE_STORE_ENABLED", "true").lower() == "true"
+FEATURE_STORE_PATH = os.getenv(
+    "FEATURE_STORE_PATH", os.path.join(WORKER_DATA_DIR, "features.sqlite3")
+)
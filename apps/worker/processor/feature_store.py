@@ -0,0 +1,163 @@
+import json
+import os
+import sqlite3
+import threading
+import zlib
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple
+
+from core.config import FEATURE_STORE_PATH
+
+from .logger import get_logger
+
+logger = get_logger("feature-store")
+
+# Rows iter_features reads from SQLite per round trip
+FETCH_ROWS = 64
+
+# audio, emotion and posture analyzer outputs of one question
+Features = Tuple[Dict[str, Any], Dict[str, Any], Dict[str, Any]]
+
+
+def _to_json(value: Any) -> Any:
+    # numpy scalars and arrays left in analyzer outputs
+    if hasattr(value, "tolist"):
+        return value.tolist()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def _pack(data: Dict[str, Any]) -> bytes:
+    text = json.dumps(data, separators=(",", ":"), default=_to_json)
+    return zlib.compress(text.encode(), 6)
+
+
+def _unpack(blob: bytes) -> Dict[str, Any]:
+    return json.loads(zlib.decompress(blob))
+
+
+class FeatureStore:
+    """SQLite store of raw per-question analyzer outputs, zlib-compressed JSON
+
+    One row per (interview, question); processing the same question again
+    replaces its row. Safe to share between threads, and between the question
+    worker processes (WAL mode, writers wait on each other's locks).
+    """
+
+    def __init__(self, path: str = FEATURE_STORE_PATH):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS features (
+                interview_id TEXT NOT NULL,
+                question_id TEXT NOT NULL,
+                processing_version TEXT NOT NULL,
+                created_at TEXT NOT NULL,
+                audio BLOB NOT NULL,
+                emotion BLOB NOT NULL,
+                posture BLOB NOT NULL,
+                PRIMARY KEY (interview_id, question_id)
+            )
+            """
+        )
+        self._conn.commit()
+
+    def put(
+        self,
+        interview_id: str,
+        question_id: str,
+        audio_data: Dict[str, Any],
+        emotion_data: Dict[str, Any],
+        posture_data: Dict[str, Any],
+        processing_version: str,
+    ) -> None:
+        row = (
+            str(interview_id),
+            str(question_id),
+            processing_version,
+            datetime.now().isoformat(),
+            _pack(audio_data),
+            _pack(emotion_data),
+            _pack(posture_data),
+        )
+        with self._lock:
+            self._conn.execute(
+                """
+                INSERT OR REPLACE INTO features
+                    (interview_id, question_id, processing_version, created_at,
+                     audio, emotion, posture)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                """,
+                row,
+            )
+            self._conn.commit()
+
+    def get(self, interview_id: str, question_id: str) -> Optional[Features]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT audio, emotion, posture FROM features "
+                "WHERE interview_id = ? AND question_id = ?",
+                (str(interview_id), str(question_id)),
+            ).fetchone()
+        if row is None:
+            return None
+        return _unpack(row[0]), _unpack(row[1]), _unpack(row[2])
+
+    def iter_features(
+        self, interview_ids: Optional[Iterable[str]] = None
+    ) -> Iterator[Tuple[str, str, Features]]:
+        """(interview_id, question_id, features) for all or some interviews"""
+        query = (
+            "SELECT interview_id, question_id, audio, emotion, posture FROM features"
+        )
+        params: Tuple[str, ...] = ()
+        if interview_ids is not None:
+            params = tuple(str(i) for i in interview_ids)
+            if not params:
+                return
+            query += f" WHERE interview_id IN ({', '.join('?' * len(params))})"
+        query += " ORDER BY interview_id, rowid"
+
+        # Streams FETCH_ROWS rows at a time, so memory does not grow with the
+        # store; rows are fetched under the lock but decompressed outside it
+        with self._lock:
+            cursor = self._conn.execute(query, params)
+        try:
+            while True:
+                with self._lock:
+                    rows = cursor.fetchmany(FETCH_ROWS)
+                if not rows:
+                    return
+                for interview_id, question_id, audio, emotion, posture in rows:
+                    yield interview_id, question_id, (
+                        _unpack(audio),
+                        _unpack(emotion),
+                        _unpack(posture),
+                    )
+        finally:
+            with self._lock:
+                cursor.close()
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM features").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_store: Optional[FeatureStore] = None
+_store_lock = threading.Lock()
+
+
+def get_feature_store() -> FeatureStore:
+    """Feature store of this process, opened on first use"""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = FeatureStore()
+            logger.info(f"Opened feature store {FEATURE_STORE_PATH}")
+        return _store
@@ -0,0 +1,125 @@
+from typing import Dict, Iterator, Tuple
+
+import numpy as np
+
+# librosa.feature.rms defaults: 2048-sample frames every 512 samples, centered
+# by padding frame_length // 2 zeros on both sides
+FRAME_LENGTH = 2048
+HOP_LENGTH = 512
+# Frames processed per block; bounds the working memory to about
+# (BLOCK_FRAMES * HOP_LENGTH + FRAME_LENGTH) samples whatever the audio length
+BLOCK_FRAMES = 4096
+# pitch_contour materializes every frame of a block plus its 2 * FRAME_LENGTH
+# point spectrum and autocorrelation, so it takes fewer frames at a time:
+# about 40 MB at peak instead of about 480 MB with BLOCK_FRAMES
+PITCH_BLOCK_FRAMES = 256
+
+# Pitch search range, covering adult speaking voices
+PITCH_MIN_HZ = 60.0
+PITCH_MAX_HZ = 400.0
+# Normalized autocorrelation peak above which a frame counts as voiced
+VOICING_THRESHOLD = 0.3
+
+
+def frame_count(
+    n_samples: int, frame_length: int = FRAME_LENGTH, hop_length: int = HOP_LENGTH
+) -> int:
+    """Number of centered frames librosa produces for n_samples samples"""
+    return 1 + (n_samples + 2 * (frame_length // 2) - frame_length) // hop_length
+
+
+def _sample_blocks(
+    y: np.ndarray,
+    frame_length: int = FRAME_LENGTH,
+    hop_length: int = HOP_LENGTH,
+    block_frames: int = BLOCK_FRAMES,
+) -> Iterator[Tuple[int, int, np.ndarray]]:
+    """(first frame index, frame count, float64 samples) per block of frames
+
+    Frames are centered like librosa's: frame i covers samples
+    [i * hop - frame_length // 2, i * hop + frame_length // 2), zero outside y,
+    and a block holds exactly the samples its frames cover. Only one block is
+    copied (and converted) at a time, so a memory-mapped signal is read
+    block by block.
+    """
+    pad = frame_length // 2
+    total = frame_count(len(y), frame_length, hop_length)
+    for first in range(0, total, block_frames):
+        frames = min(block_frames, total - first)
+        start = first * hop_length - pad
+        end = start + (frames - 1) * hop_length + frame_length
+        block = np.zeros(end - start, dtype=np.float64)
+        lo, hi = max(start, 0), min(end, len(y))
+        if hi > lo:
+            block[lo - start : hi - start] = y[lo:hi]
+        yield first, frames, block
+
+
+def frame_rms(
+    y: np.ndarray, frame_length: int = FRAME_LENGTH, hop_length: int = HOP_LENGTH
+) -> np.ndarray:
+    """Per-frame RMS energy, matching librosa.feature.rms(y=y)[0]"""
+    rms = np.empty(frame_count(len(y), frame_length, hop_length), dtype=np.float32)
+    for first, frames, block in _sample_blocks(y, frame_length, hop_length):
+        # Frame energies as differences of a running sum of squares, instead of
+        # squaring every sample once per overlapping frame
+        energy = np.concatenate(([0.0], np.cumsum(block**2)))
+        starts = np.arange(frames) * hop_length
+        power = (energy[starts + frame_length] - energy[starts]) / frame_length
+        rms[first : first + frames] = np.sqrt(np.maximum(power, 0.0))
+    return rms
+
+
+def volume_variation(y: np.ndarray) -> float:
+    """Standard deviation of the framed RMS energy of a signal"""
+    return float(np.std(frame_rms(y).astype(np.float64)))
+
+
+def pitch_contour(
+    y: np.ndarray,
+    sr: int,
+    frame_length: int = FRAME_LENGTH,
+    hop_length: int = HOP_LENGTH,
+) -> np.ndarray:
+    """Per-frame fundamental frequency in Hz by autocorrelation, 0 if unvoiced
+
+    Uses the same frames as frame_rms, so the contours line up frame by frame.
+    """
+    min_lag = max(1, int(sr / PITCH_MAX_HZ))
+    max_lag = min(frame_length - 1, int(sr / PITCH_MIN_HZ))
+    n_fft = 2 * frame_length
+    window = np.hanning(frame_length)
+
+    pitch = np.zeros(frame_count(len(y), frame_length, hop_length), dtype=np.float32)
+    blocks = _sample_blocks(y, frame_length, hop_length, PITCH_BLOCK_FRAMES)
+    for first, count, block in blocks:
+        frames = np.lib.stride_tricks.sliding_window_view(block, frame_length)
+        frames = frames[::hop_length]
+        frames = (frames - frames.mean(axis=1, keepdims=True)) * window
+        spectrum = np.fft.rfft(frames, n=n_fft, axis=1)
+        autocorr = np.fft.irfft(np.abs(spectrum) ** 2, n=n_fft, axis=1)
+        energy = autocorr[:, 0]
+        lags = autocorr[:, min_lag : max_lag + 1]
+        best = np.argmax(lags, axis=1)
+        peak = lags[np.arange(len(lags)), best]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            voiced = (energy > 0) & (peak / energy > VOICING_THRESHOLD)
+        f0 = np.where(voiced, sr / (best + min_lag), 0.0)
+        pitch[first : first + count] = f0
+    return pitch
+
+
+def audio_contours(y: np.ndarray, sr: int) -> Dict[str, np.ndarray]:
+    """Frame times (s), RMS energy and pitch (Hz, 0 when unvoiced) of a signal"""
+    energy = frame_rms(y)
+    times = np.arange(len(energy)) * HOP_LENGTH / sr
+    return {"times": times, "energy": energy, "pitch": pitch_contour(y, sr)}
+
+
+def pitch_variation(y: np.ndarray, sr: int) -> float:
+    """Standard deviation of the voiced pitch in semitones (0.0 if < 2 voiced)"""
+    pitch = pitch_contour(y, sr)
+    voiced = pitch[pitch > 0].astype(np.float64)
+    if len(voiced) < 2:
+        return 0.0
+    return float(np.std(12 * np.log2(voiced / np.median(voiced))))
@@ -1,121 +1,378 @@
 import os
-import re
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
 
-import librosa
 import numpy as np
-from faster_whisper import WhisperModel
+from core.config import (
+    WHISPER_BEAM_SIZE,
+    WHISPER_COMPUTE_TYPE,
+    WHISPER_CPU_THREADS,
+    WHISPER_DEVICE,
+    WHISPER_LANGUAGE,
+    WHISPER_MODEL_SIZE,
+    WHISPER_NUM_WORKERS,
+    WHISPER_PROFILE,
+    WHISPER_PROFILES,
+)
 
+from .audio_features import pitch_variation, volume_variation
+from .fillers import get_filler_matcher
+from .model_registry import get_whisper_model
 
-def analyze_audio(audio_path: str) -> dict:
-    try:
-        # Check if file exists first
-        if not os.path.exists(audio_path):
-            raise FileNotFoundError(f"Audio file not found: {audio_path}")
+# Rate of the PCM extract_audio decodes to, and that Whisper expects
+SAMPLE_RATE = 16000
+
+WHISPER_MODEL_SIZES = (
+    "tiny",
+    "tiny.en",
+    "base",
+    "base.en",
+    "small",
+    "small.en",
+    "distil-small.en",
+    "medium",
+    "medium.en",
+    "distil-medium.en",
+    "large-v2",
+    "large-v3",
+    "distil-large-v2",
+    "distil-large-v3",
+    "large-v3-turbo",
+)
+
+
+class TranscriptionProfile(NamedTuple):
+    name: str
+    model_size: str = WHISPER_MODEL_SIZE
+    compute_type: str = WHISPER_COMPUTE_TYPE
+    device: str = WHISPER_DEVICE
+    beam_size: int = WHISPER_BEAM_SIZE
+    cpu_threads: int = WHISPER_CPU_THREADS
+    num_workers: int = WHISPER_NUM_WORKERS
+    language: Optional[str] = WHISPER_LANGUAGE
+
+    def model_kwargs(self) -> Dict[str, Any]:
+        """Arguments of get_whisper_model; the rest only affect decoding"""
+        return {
+            "model_size": self.model_size,
+            "compute_type": self.compute_type,
+            "device": self.device,
+            "cpu_threads": self.cpu_threads,
+            "num_workers": self.num_workers,
+        }
+
+    def describe(self) -> Dict[str, Any]:
+        """Profile as recorded in results"""
+        return {
+            "name": self.name,
+            "modelSize": self.model_size,
+            "computeType": self.compute_type,
+            "beamSize": self.beam_size,
+            "cpuThreads": self.cpu_threads,
+            "numWorkers": self.num_workers,
+            "language": self.language,
+        }
+
+
+# Per-job overrides (options.whisper) in request casing -> profile field. Only
+# decoding settings: every distinct model setting loads another Whisper model,
+# so those are limited to the operator-defined WHISPER_PROFILES
+_PROFILE_OPTIONS = {
+    "beamSize": "beam_size",
+    "language": "language",
+}
+_MODEL_OPTIONS = ("modelSize", "computeType", "cpuThreads", "numWorkers")
+
+
+def resolve_transcription_profile(
+    options: Optional[Dict[str, Any]] = None,
+) -> TranscriptionProfile:
+    """Transcription settings for a job
 
-        model = WhisperModel("medium", device="cpu", compute_type="int8")
+    Starts from the WHISPER_* defaults, applies the named profile
+    (options.whisperProfile, else WHISPER_PROFILE) from WHISPER_PROFILES, then
+    any individual decoding settings in options.whisper, e.g. {"beamSize": 1}.
+    Raises ValueError for anything invalid, so requests can be rejected early.
+    """
+    options = options or {}
+    name = options.get("whisperProfile") or WHISPER_PROFILE
+    settings: Dict[str, Any] = {}
+    if name:
+        if name not in WHISPER_PROFILES:
+            raise ValueError(
+                f"Unknown whisper profile '{name}', "
+                f"expected one of {sorted(WHISPER_PROFILES)}"
+            )
+        settings.update(WHISPER_PROFILES[name])
 
-        # Explicitly request word timestamps
-        segments, info = model.transcribe(
-            audio_path, word_timestamps=True, vad_filter=True, language="en"
+    overrides = options.get("whisper") or {}
+    if not isinstance(overrides, dict):
+        raise ValueError("Whisper options must be an object")
+    model_options = [key for key in overrides if key in _MODEL_OPTIONS]
+    if model_options:
+        raise ValueError(
+            f"Whisper options {model_options} load a separate model and can only "
+            f"be set through a profile, one of {sorted(WHISPER_PROFILES)}"
         )
-        segments = list(segments)
-
-        text = ""
-        confidences = []
-        word_timings = []
-        disfluency_timings = []
-        pause_locations = []
-        total_words = 0
-        total_duration = 0.0
-        pause_count = 0
-        last_end = 0.0
-
-        filler_words_list = ["um", "uh", "like", "you know"]
-        filler_pattern = re.compile(
-            r"\b(" + "|".join(re.escape(fw) for fw in filler_words_list) + r")\b",
-            re.IGNORECASE,
+    unknown = [key for key in overrides if key not in _PROFILE_OPTIONS]
+    if unknown:
+        raise ValueError(f"Unknown whisper options {unknown}")
+    for key, value in overrides.items():
+        settings[_PROFILE_OPTIONS[key]] = value
+    if overrides:
+        name = f"{name or 'default'}+custom"
+
+    profile = TranscriptionProfile(name=name or "default", **settings)
+    if profile.model_size not in WHISPER_MODEL_SIZES:
+        raise ValueError(
+            f"Unknown whisper model size '{profile.model_size}', "
+            f"expected one of {WHISPER_MODEL_SIZES}"
+        )
+    try:
+        return profile._replace(
+            beam_size=max(1, int(profile.beam_size)),
+            cpu_threads=max(0, int(profile.cpu_threads)),
+            num_workers=max(1, int(profile.num_workers)),
+            language=profile.language or None,
+        )
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"Invalid whisper settings: {str(e)}")
+
+
+def transcribe(
+    audio: np.ndarray, profile: Optional[TranscriptionProfile] = None
+) -> List[Dict[str, Any]]:
+    """Transcribe 16 kHz samples into plain segment dicts with word timestamps"""
+    profile = profile or resolve_transcription_profile()
+    model = get_whisper_model(**profile.model_kwargs())
+
+    # Explicitly request word timestamps
+    segments, info = model.transcribe(
+        audio,
+        word_timestamps=True,
+        vad_filter=True,
+        language=profile.language,
+        beam_size=profile.beam_size,
+    )
+
+    return segment_dicts(segments)
+
+
+def segment_dicts(segments: Iterable[Any]) -> List[Dict[str, Any]]:
+    """faster-whisper segments as plain dicts, consuming the generator"""
+    result = []
+    for segment in segments:
+        words = None
+        # Check if words attribute exists and is not None
+        if hasattr(segment, "words") and segment.words is not None:
+            words = [
+                {"word": w.word, "start": w.start, "end": w.end} for w in segment.words
+            ]
+        result.append(
+            {
+                "start": segment.start,
+                "end": segment.end,
+                "text": segment.text,
+                "avg_logprob": segment.avg_logprob,
+                "words": words,
+            }
         )
-        filler_counts = {fw: 0 for fw in filler_words_list}
-
-        for segment in segments:
-            text += segment.text.strip() + " "
-            confidences.append(segment.avg_logprob)
-            total_duration += segment.end - segment.start
-            words = segment.text.strip().split()
-            total_words += len(words)
-
-            # Word timings & disfluency timings
-            # Check if words attribute exists and is not None
-            if hasattr(segment, "words") and segment.words is not None:
-                for word_info in segment.words:
-                    word_timings.append(
-                        {
-                            "word": word_info.word,
-                            "start": round(word_info.start, 2),
-                            "end": round(word_info.end, 2),
-                        }
-                    )
-
-                    word_lower = word_info.word.lower()
-                    if filler_pattern.search(word_lower):
-                        # Find which filler word matched
-                        for filler in filler_words_list:
-                            if re.search(
-                                r"\b" + re.escape(filler) + r"\b",
-                                word_lower,
-                                re.IGNORECASE,
-                            ):
-                                disfluency_timings.append(
-                                    {
-                                        "word": filler,
-                                        "timestamp": round(word_info.start, 2),
-                                    }
-                                )
-                                filler_counts[filler] += 1
-                                break
+    return result
+
+
+def split_segments(
+    segments: List[Dict[str, Any]], windows: Sequence[Tuple[float, float]]
+) -> List[List[Dict[str, Any]]]:
+    """Split whole-file segments into per-window buckets rebased to window start
+
+    A word belongs to the window its start time falls in. Segments that cross a
+    window boundary are cut at word level, so every bucket looks like the output
+    of transcribing that window's audio slice on its own.
+    """
+    buckets: List[List[Dict[str, Any]]] = [[] for _ in windows]
+
+    for segment in segments:
+        for i, (win_start, win_end) in enumerate(windows):
+            if segment["end"] <= win_start or segment["start"] >= win_end:
+                continue
+
+            start = max(segment["start"], win_start) - win_start
+            end = min(segment["end"], win_end) - win_start
+            words = segment["words"]
+            if words:
+                words = [w for w in words if win_start <= w["start"] < win_end]
+                if not words:
+                    continue
+                split = len(words) != len(segment["words"])
+                text = "".join(w["word"] for w in words) if split else segment["text"]
+                words = [
+                    {
+                        "word": w["word"],
+                        "start": max(0.0, w["start"] - win_start),
+                        "end": min(w["end"], win_end) - win_start,
+                    }
+                    for w in words
+                ]
+                if split:
+                    # A cut segment spans only the words it kept
+                    start, end = words[0]["start"], words[-1]["end"]
+            elif not win_start <= segment["start"] < win_end:
+                continue
             else:
-                # If word-level timestamps aren't available, add a segment-level entry
-                print(
-                    f"Warning: Word-level timestamps not available for segment: '{segment.text}'"
+                text = segment["text"]
+
+            buckets[i].append(
+                {
+                    "start": start,
+                    "end": end,
+                    "text": text,
+                    "avg_logprob": segment["avg_logprob"],
+                    "words": words,
+                }
+            )
+    return buckets
+
+
+def open_pcm(audio_path: str) -> np.ndarray:
+    """Memory-map raw 16 kHz mono float32 PCM written by extract_audio
+
+    Nothing is decoded or copied; slices of the map (see pcm_window) are views
+    that Whisper and the volume analysis read straight from the page cache.
+    """
+    if os.path.getsize(audio_path) == 0:
+        # mmap cannot map an empty file (e.g. a recording without speech)
+        return np.zeros(0, dtype=np.float32)
+    return np.memmap(audio_path, dtype="<f4", mode="r")
+
+
+def pcm_window(pcm: np.ndarray, start_s: float, end_s: float) -> np.ndarray:
+    """Zero-copy view of the samples between start_s and end_s"""
+    return pcm[int(start_s * SAMPLE_RATE) : int(end_s * SAMPLE_RATE)]
+
+
+def summarize_segments(
+    segments: List[Dict[str, Any]],
+    samples: Optional[np.ndarray] = None,
+    language: Optional[str] = None,
+) -> dict:
+    """Build speech features from transcript segments and the matching samples"""
+    text = ""
+    confidences = []
+    word_timings = []
+    pause_locations = []
+    total_words = 0
+    total_duration = 0.0
+    pause_count = 0
+    last_end = 0.0
+
+    for segment in segments:
+        text += segment["text"].strip() + " "
+        confidences.append(segment["avg_logprob"])
+        total_duration += segment["end"] - segment["start"]
+        words = segment["text"].strip().split()
+        total_words += len(words)
+
+        # Word timings
+        if segment["words"] is not None:
+            for word_info in segment["words"]:
+                word_timings.append(
+                    {
+                        "word": word_info["word"],
+                        "start": round(word_info["start"], 2),
+                        "end": round(word_info["end"], 2),
+                    }
                 )
+        else:
+            # If word-level timestamps aren't available, add a segment-level entry
+            print(
+                f"Warning: Word-level timestamps not available for segment: '{segment['text']}'"
+            )
 
-            # Pause locations
-            if last_end > 0 and segment.start - last_end >= 0.5:
-                pause_locations.append(round(last_end, 2))
-                pause_count += 1
-            last_end = segment.end
+        # Pause locations
+        if last_end > 0 and segment["start"] - last_end >= 0.5:
+            pause_locations.append(round(last_end, 2))
+            pause_count += 1
+        last_end = segment["end"]
 
-        avg_confidence = sum(confidences) / len(confidences) if confidences else 0.0
-        duration_minutes = total_duration / 60 if total_duration > 0 else 1
-        words_per_minute = total_words / duration_minutes
+    # Disfluencies: one pass over the words, fillers may span several words
+    disfluency_timings, filler_counts = get_filler_matcher(language).scan(word_timings)
 
-        # Volume variation
-        try:
-            y, sr = librosa.load(audio_path, sr=None)
-            rms = librosa.feature.rms(y=y)[0]
-            volume_variation = float(np.std(rms))
-        except Exception as e:
-            print(f"Warning: Could not analyze volume variation: {e}")
-            volume_variation = 0.0
+    avg_confidence = sum(confidences) / len(confidences) if confidences else 0.0
+    duration_minutes = total_duration / 60 if total_duration > 0 else 1
+    words_per_minute = total_words / duration_minutes
 
-        speech_rate = total_words / total_duration if total_duration > 0 else 0.0
+    # Volume variation
+    try:
+        if samples is None:
+            raise ValueError("no audio samples")
+        volume = volume_variation(samples)
+    except Exception as e:
+        print(f"Warning: Could not analyze volume variation: {e}")
+        volume = 0.0
 
-        return {
-            "text": text.strip(),
-            "confidence": round(np.exp(avg_confidence), 2),
-            "words_per_minute": round(words_per_minute, 2),
-            "speech_rate": round(speech_rate, 2),
-            "pause_count": pause_count,
-            "pauseLocations": pause_locations,
-            "volume_variation": round(volume_variation, 4),
-            "filler_words": filler_counts,
-            "disfluencies": disfluency_timings,
-            "word_timings": word_timings,
-        }
+    # Pitch variation
+    try:
+        if samples is None:
+            raise ValueError("no audio samples")
+        pitch = pitch_variation(samples, SAMPLE_RATE)
+    except Exception as e:
+        print(f"Warning: Could not analyze pitch variation: {e}")
+        pitch = 0.0
+
+    speech_rate = total_words / total_duration if total_duration > 0 else 0.0
+
+    return {
+        "text": text.strip(),
+        "confidence": round(np.exp(avg_confidence), 2),
+        "words_per_minute": round(words_per_minute, 2),
+        "speech_rate": round(speech_rate, 2),
+        "pause_count": pause_count,
+        "pauseLocations": pause_locations,
+        "volume_variation": round(volume, 4),
+        "pitch_variation": round(pitch, 2),
+        "filler_words": filler_counts,
+        "disfluencies": disfluency_timings,
+        "word_timings": word_timings,
+    }
+
+
+def analyze_audio(
+    samples: np.ndarray, profile: Optional[TranscriptionProfile] = None
+) -> dict:
+    """Speech features of one answer from its 16 kHz samples (see pcm_window)"""
+    try:
+        profile = profile or resolve_transcription_profile()
+        segments = transcribe(samples, profile)
+        return summarize_segments(segments, samples, profile.language)
 
-    except FileNotFoundError as e:
-        print(f"File not found: {e}")
-        raise Exception(f"Audio analysis failed: {str(e)}")
     except Exception as e:
         print(f"Error in analyze_audio: {e}")
         raise Exception(f"Audio analysis failed: {str(e)}")
+
+
+def analyze_interview_audio(
+    audio_path: str,
+    windows: Sequence[Tuple[float, float]],
+    profile: Optional[TranscriptionProfile] = None,
+) -> List[dict]:
+    """Transcribe the full interview audio once and analyze each window of it
+
+    windows are (start_s, end_s) pairs; per-window timings are relative to the
+    window start, matching what analyze_audio returns for that window alone.
+    """
+    try:
+        if not os.path.exists(audio_path):
+            raise FileNotFoundError(f"Audio file not found: {audio_path}")
+
+        profile = profile or resolve_transcription_profile()
+        pcm = open_pcm(audio_path)
+        buckets = split_segments(transcribe(pcm, profile), windows)
+        return [
+            summarize_segments(
+                bucket, pcm_window(pcm, start_s, end_s), profile.language
+            )
+            for (start_s, end_s), bucket in zip(windows, buckets)
+        ]
+
+    except Exception as e:
+        print(f"Error in analyze_interview_audio: {e}")
+        raise Exception(f"Audio analysis failed: {str(e)}")
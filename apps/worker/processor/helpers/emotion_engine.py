@@ -0,0 +1,194 @@
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+from core.config import FACE_REDETECT_INTERVAL, FACE_TRACK_MIN_SCORE
+from deepface import DeepFace
+
+from .model_registry import registry
+
+EMOTION_INPUT_SIZE = (48, 48)
+
+# DeepFace caches one detector per backend and shares it between threads, and
+# MediaPipe's FaceDetection graph is not thread-safe: every DeepFace call that
+# detects faces (extract_faces, analyze) must hold this lock
+face_detector_lock = threading.Lock()
+
+
+def get_emotion_model():
+    """DeepFace's Keras emotion classifier, loaded once per process"""
+
+    def load():
+        from deepface.modules import modeling
+
+        return modeling.build_model(task="facial_attribute", model_name="Emotion")
+
+    return registry.get(("deepface", "Emotion"), load)
+
+
+def emotion_labels() -> List[str]:
+    from deepface.models.demography import Emotion
+
+    return list(Emotion.labels)
+
+
+def detect_faces(frame: np.ndarray, detector_backend: str = "mediapipe") -> List[dict]:
+    """Faces in a BGR frame as returned by DeepFace (whole frame if none found)"""
+    with face_detector_lock:
+        return DeepFace.extract_faces(
+            img_path=frame,
+            detector_backend=detector_backend,
+            enforce_detection=False,
+            align=True,
+        )
+
+
+def preprocess_face(face: np.ndarray) -> np.ndarray:
+    """48x48 grayscale emotion model input from a DeepFace RGB [0, 1] face crop
+
+    Same steps DeepFace.analyze takes before the emotion model: back to BGR,
+    pad/resize to 224x224, grayscale, then down to 48x48.
+    """
+    from deepface.modules import preprocessing
+
+    img = preprocessing.resize_image(img=face[:, :, ::-1], target_size=(224, 224))
+    gray = cv2.cvtColor(img[0].astype(np.float32), cv2.COLOR_BGR2GRAY)
+    return cv2.resize(gray, EMOTION_INPUT_SIZE)
+
+
+def classify_faces(faces: List[np.ndarray]) -> List[Dict[str, float]]:
+    """Emotion percentages for a batch of preprocessed faces in one forward pass"""
+    if not faces:
+        return []
+    batch = np.stack(faces)[..., np.newaxis]
+    predictions = get_emotion_model().model.predict(batch, verbose=0)
+    labels = emotion_labels()
+    scores = []
+    for prediction in predictions:
+        total = float(prediction.sum()) or 1.0
+        scores.append(
+            {label: 100 * float(p) / total for label, p in zip(labels, prediction)}
+        )
+    return scores
+
+
+def face_input(
+    frame: np.ndarray, tracker: Optional["FaceTracker"] = None
+) -> Optional[np.ndarray]:
+    """Find the first face in a frame and preprocess it for classify_faces"""
+    if tracker is not None:
+        face = tracker.locate(frame)
+    else:
+        faces = detect_faces(frame)
+        face = faces[0]["face"] if faces else None
+    if face is None or face.shape[0] == 0 or face.shape[1] == 0:
+        return None
+    return preprocess_face(face)
+
+
+class FaceTracker:
+    """Follows one face between sampled frames instead of re-detecting it
+
+    After a detection the face box is tracked by template matching the last
+    crop in a window around its previous position. The detector runs again
+    every redetect_every frames, or as soon as the match score drops below
+    min_score (face moved too far, turned away or was occluded).
+    """
+
+    def __init__(
+        self,
+        redetect_every: int = FACE_REDETECT_INTERVAL,
+        min_score: float = FACE_TRACK_MIN_SCORE,
+        search_margin: float = 0.5,
+    ):
+        self.redetect_every = redetect_every
+        self.min_score = min_score
+        self.search_margin = search_margin
+        self.box: Optional[Tuple[int, int, int, int]] = None
+        self.template: Optional[np.ndarray] = None
+        self.since_detect = 0
+        self.detector_calls = 0
+        self.tracked_frames = 0
+        self.detect_ms = 0.0
+        self.track_ms = 0.0
+
+    def _detect(self, frame: np.ndarray, gray: np.ndarray) -> Optional[np.ndarray]:
+        start = time.perf_counter()
+        try:
+            faces = detect_faces(frame)
+        finally:
+            self.detector_calls += 1
+            self.detect_ms += (time.perf_counter() - start) * 1000
+        self.since_detect = 0
+        self.box = self.template = None
+        if not faces:
+            return None
+
+        face = faces[0]
+        area = face.get("facial_area") or {}
+        # Without a detection DeepFace returns the whole frame at confidence 0
+        if (
+            face.get("confidence", 0) > 0
+            and area.get("w", 0) > 0
+            and area.get("h", 0) > 0
+        ):
+            x, y = max(0, int(area["x"])), max(0, int(area["y"]))
+            w, h = int(area["w"]), int(area["h"])
+            template = gray[y : y + h, x : x + w]
+            if template.size:
+                self.box = (x, y, template.shape[1], template.shape[0])
+                self.template = template.copy()
+        return face["face"]
+
+    def _track(self, frame: np.ndarray, gray: np.ndarray) -> Optional[np.ndarray]:
+        start = time.perf_counter()
+        try:
+            x, y, w, h = self.box
+            mx, my = int(w * self.search_margin), int(h * self.search_margin)
+            x0, y0 = max(0, x - mx), max(0, y - my)
+            x1 = min(gray.shape[1], x + w + mx)
+            y1 = min(gray.shape[0], y + h + my)
+            window = gray[y0:y1, x0:x1]
+            th, tw = self.template.shape[:2]
+            if window.shape[0] < th or window.shape[1] < tw:
+                return None
+
+            scores = cv2.matchTemplate(window, self.template, cv2.TM_CCOEFF_NORMED)
+            _, score, _, (dx, dy) = cv2.minMaxLoc(scores)
+            if score < self.min_score:
+                return None
+
+            x, y = x0 + dx, y0 + dy
+            self.box = (x, y, tw, th)
+            self.template = gray[y : y + th, x : x + tw].copy()
+            self.since_detect += 1
+            self.tracked_frames += 1
+            # Same layout DeepFace.extract_faces returns: RGB scaled to [0, 1]
+            return frame[y : y + th, x : x + tw, ::-1].astype(np.float32) / 255
+        finally:
+            self.track_ms += (time.perf_counter() - start) * 1000
+
+    def locate(self, frame: np.ndarray) -> Optional[np.ndarray]:
+        """Face crop for a BGR frame, RGB in [0, 1] like DeepFace.extract_faces"""
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        if self.box is not None and self.since_detect < self.redetect_every - 1:
+            face = self._track(frame, gray)
+            if face is not None:
+                return face
+        return self._detect(frame, gray)
+
+    def metrics(self) -> dict:
+        frames = self.detector_calls + self.tracked_frames
+        speedup = 1.0
+        if self.detector_calls and frames:
+            # Cost of detecting every frame against what locating actually took
+            detect_all_ms = self.detect_ms / self.detector_calls * frames
+            spent_ms = self.detect_ms + self.track_ms
+            speedup = round(detect_all_ms / spent_ms, 2) if spent_ms else 1.0
+        return {
+            "detector_calls": self.detector_calls,
+            "tracked_frames": self.tracked_frames,
+            "speedup": speedup,
+        }
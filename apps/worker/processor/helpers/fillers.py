@@ -0,0 +1,92 @@
+import re
+import string
+from bisect import bisect_right
+from functools import lru_cache
+from itertools import accumulate
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from core.config import FILLER_DEFAULT_LANGUAGE, FILLER_LEXICONS
+
+# Punctuation Whisper attaches to words, mapped to spaces so fillers are
+# matched on bare tokens ("Um," -> "um", "uh-huh" -> "uh huh")
+_PUNCTUATION = str.maketrans({c: " " for c in string.punctuation + "¿¡«»“”‘’…–—"})
+# Key under which a trie node stores the phrase that ends there
+_PHRASE = ""
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased word tokens, dropping punctuation and Whisper's spacing"""
+    return text.lower().translate(_PUNCTUATION).split()
+
+
+def _trie_pattern(node: Dict[str, Any]) -> str:
+    """Regex alternation that walks the trie below node, longest match first"""
+    branches = []
+    for token in sorted(k for k in node if k != _PHRASE):
+        child = node[token]
+        rest = _trie_pattern(child) if len(child) > (_PHRASE in child) else ""
+        if rest:
+            # Optional continuation: the greedy ? tries the longer phrase first
+            rest = rf"(?:\s+{rest})" + ("?" if _PHRASE in child else "")
+        branches.append(re.escape(token) + rest)
+    return "(?:" + "|".join(branches) + ")" if branches else ""
+
+
+class FillerMatcher:
+    """Finds filler phrases in a word sequence with a trie over their tokens
+
+    Phrases may span several words ("you know"). The trie is compiled once
+    into a regex, and a transcript is matched in a single pass over its
+    normalized text: each position takes the longest phrase starting there,
+    and matched tokens are not reused.
+    """
+
+    def __init__(self, phrases: Sequence[str]):
+        self.phrases = list(dict.fromkeys(phrases))
+        self._root: Dict[str, Any] = {}
+        self._by_tokens: Dict[str, str] = {}
+        for phrase in self.phrases:
+            tokens = tokenize(phrase)
+            if not tokens:
+                continue
+            node = self._root
+            for token in tokens:
+                node = node.setdefault(token, {})
+            node[_PHRASE] = phrase
+            self._by_tokens[" ".join(tokens)] = phrase
+
+        body = _trie_pattern(self._root)
+        self._pattern = re.compile(rf"(?<!\w){body}(?!\w)") if body else None
+
+    def scan(
+        self, words: Sequence[Dict[str, Any]]
+    ) -> Tuple[List[Dict[str, Any]], Dict[str, int]]:
+        """Disfluencies ({word, timestamp}) and per-phrase counts for word timings
+
+        A match is timestamped with the start of the word it begins in.
+        """
+        disfluencies = []
+        counts = {phrase: 0 for phrase in self.phrases}
+        if self._pattern is None or not words:
+            return disfluencies, counts
+
+        # One normalized line per word; the newlines separate tokens like spaces
+        text = "\n".join(w["word"] for w in words).lower().translate(_PUNCTUATION)
+        # Offset just past each word's line, to map a match back to its word
+        line_ends = list(accumulate(map((1).__add__, map(len, text.split("\n")))))
+
+        for match in self._pattern.finditer(text):
+            phrase = self._by_tokens[" ".join(match.group().split())]
+            word = words[bisect_right(line_ends, match.start())]
+            disfluencies.append({"word": phrase, "timestamp": word["start"]})
+            counts[phrase] += 1
+        return disfluencies, counts
+
+
+@lru_cache(maxsize=None)
+def get_filler_matcher(language: Optional[str] = None) -> FillerMatcher:
+    """Matcher for a language's lexicon (FILLER_LEXICONS), built once"""
+    lexicon = FILLER_LEXICONS.get(language or FILLER_DEFAULT_LANGUAGE)
+    if lexicon is None:
+        lexicon = FILLER_LEXICONS.get(FILLER_DEFAULT_LANGUAGE, [])
+    return FillerMatcher(lexicon)
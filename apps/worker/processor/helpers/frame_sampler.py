@@ -0,0 +1,352 @@
+import subprocess
+import time
+from typing import Iterator, NamedTuple, Optional, Tuple
+
+import cv2
+import numpy as np
+from core.config import (
+    ADAPTIVE_DIFF_THRESHOLD,
+    ADAPTIVE_MAX_INTERVAL,
+    ADAPTIVE_MIN_INTERVAL,
+    FRAME_READER,
+    FRAME_SAMPLING,
+    INFERENCE_MAX_SIDE,
+)
+
+FRAME_READERS = ("seek", "grab", "ffmpeg", "pyav")
+FRAME_SAMPLING_MODES = ("fixed", "adaptive")
+
+# Thumbnail size for the scene change check between candidate frames
+_DIFF_SIZE = (64, 36)
+
+
+class SampledFrame(NamedTuple):
+    index: int
+    timestamp: float
+    image: np.ndarray
+    decode_ms: float
+    # RGB copy of image, shared by analyzers that need RGB (see inference_frames)
+    rgb: Optional[np.ndarray] = None
+
+
+def _probe(video_path: str):
+    """fps, frame count and frame size as reported by OpenCV"""
+    cap = cv2.VideoCapture(video_path)
+    try:
+        fps = cap.get(cv2.CAP_PROP_FPS) or 25
+        frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+        height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+    finally:
+        cap.release()
+    return fps, frame_count, width, height
+
+
+def _frame_window(
+    fps: float, frame_count: int, start_s: float, end_s: Optional[float]
+) -> Tuple[int, Optional[int]]:
+    """First and one-past-last frame index of a (start_s, end_s) window
+
+    The end is None when neither end_s nor a usable frame count is known.
+    """
+    start_frame = max(0, int(round(start_s * fps)))
+    end_frame = None if end_s is None else int(round(end_s * fps))
+    if frame_count > 0:
+        end_frame = frame_count if end_frame is None else min(end_frame, frame_count)
+    return start_frame, end_frame
+
+
+def _sample_rate(fps: float, interval_s: float) -> int:
+    """Frames between samples; int(fps) at the default one-second interval"""
+    return max(1, int(fps * interval_s))
+
+
+def _seek_frames(
+    video_path: str, start_s: float, end_s: Optional[float], interval_s: float = 1.0
+) -> Iterator[SampledFrame]:
+    """Seek to every sampled frame; each seek decodes forward from a keyframe"""
+    cap = cv2.VideoCapture(video_path)
+    try:
+        fps = cap.get(cv2.CAP_PROP_FPS) or 25
+        frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        sample_rate = _sample_rate(fps, interval_s)
+        start_frame, end_frame = _frame_window(fps, frame_count, start_s, end_s)
+
+        for frame_idx in range(start_frame, end_frame or 0, sample_rate):
+            decode_start = time.perf_counter()
+            cap.set(cv2.CAP_PROP_POS_FRAMES, frame_idx)
+            ret, frame = cap.read()
+            decode_ms = (time.perf_counter() - decode_start) * 1000
+            if not ret:
+                continue
+            index = frame_idx - start_frame
+            yield SampledFrame(index, index / fps, frame, decode_ms)
+    finally:
+        cap.release()
+
+
+def _grab_frames(
+    video_path: str, start_s: float, end_s: Optional[float], interval_s: float = 1.0
+) -> Iterator[SampledFrame]:
+    """Stream frames in order, only converting the sampled ones to images"""
+    cap = cv2.VideoCapture(video_path)
+    try:
+        fps = cap.get(cv2.CAP_PROP_FPS) or 25
+        sample_rate = _sample_rate(fps, interval_s)
+        # Sequential reads stop at end of stream, so the frame count is not needed
+        start_frame, end_frame = _frame_window(fps, 0, start_s, end_s)
+
+        decode_start = time.perf_counter()
+        # One seek to the start of the window, then strictly sequential reads
+        if start_frame > 0:
+            cap.set(cv2.CAP_PROP_POS_FRAMES, start_frame)
+
+        index = 0
+        while end_frame is None or start_frame + index < end_frame:
+            if not cap.grab():
+                break
+            if index % sample_rate == 0:
+                ret, frame = cap.retrieve()
+                # Cost of a sample includes the grabs of the frames skipped before it
+                decode_ms = (time.perf_counter() - decode_start) * 1000
+                if ret:
+                    yield SampledFrame(index, index / fps, frame, decode_ms)
+                decode_start = time.perf_counter()
+            index += 1
+    finally:
+        cap.release()
+
+
+def _ffmpeg_frames(
+    video_path: str, start_s: float, end_s: Optional[float], interval_s: float = 1.0
+) -> Iterator[SampledFrame]:
+    """Let ffmpeg drop unsampled frames and pipe only the sampled ones as BGR"""
+    fps, _, width, height = _probe(video_path)
+    if width <= 0 or height <= 0:
+        raise Exception(f"Could not read frame size of {video_path}")
+    sample_rate = _sample_rate(fps, interval_s)
+    frame_bytes = width * height * 3
+
+    window = []
+    if start_s > 0:
+        window += ["-ss", str(start_s)]
+    if end_s is not None:
+        window += ["-t", str(end_s - start_s)]
+
+    cmd = [
+        "ffmpeg",
+        "-v",
+        "error",
+        *window,
+        "-i",
+        video_path,
+        "-vf",
+        f"select=not(mod(n\\,{sample_rate}))",
+        "-vsync",
+        "0",
+        "-f",
+        "rawvideo",
+        "-pix_fmt",
+        "bgr24",
+        "pipe:1",
+    ]
+    proc = subprocess.Popen(
+        cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, bufsize=frame_bytes
+    )
+    try:
+        sample = 0
+        while True:
+            decode_start = time.perf_counter()
+            buffer = bytearray(frame_bytes)
+            if proc.stdout.readinto(buffer) < frame_bytes:
+                break
+            frame = np.frombuffer(buffer, dtype=np.uint8).reshape(height, width, 3)
+            decode_ms = (time.perf_counter() - decode_start) * 1000
+            frame_idx = sample * sample_rate
+            yield SampledFrame(frame_idx, frame_idx / fps, frame, decode_ms)
+            sample += 1
+    finally:
+        proc.stdout.close()
+        if proc.poll() is None:
+            proc.kill()
+        proc.wait()
+
+
+def _pyav_frames(
+    video_path: str, start_s: float, end_s: Optional[float], interval_s: float = 1.0
+) -> Iterator[SampledFrame]:
+    """Decode with PyAV and sample by presentation time, one frame per interval
+
+    Works on variable frame rate WebM straight from MediaRecorder, where the
+    frame rate OpenCV reports is not usable for index-based sampling.
+    """
+    import av
+
+    container = av.open(video_path)
+    try:
+        stream = container.streams.video[0]
+        stream.thread_type = "AUTO"
+        if start_s > 0:
+            try:
+                # Lands on the keyframe before start_s; earlier frames are skipped
+                container.seek(int(start_s / stream.time_base), stream=stream)
+            except Exception:
+                pass  # no index: decode from the beginning instead
+
+        index = 0
+        next_sample = 0.0
+        decode_start = time.perf_counter()
+        for frame in container.decode(stream):
+            if frame.time is None:
+                continue
+            if end_s is not None and frame.time >= end_s:
+                break
+            timestamp = frame.time - start_s
+            if timestamp < 0:
+                continue
+            if timestamp >= next_sample:
+                image = frame.to_ndarray(format="bgr24")
+                decode_ms = (time.perf_counter() - decode_start) * 1000
+                yield SampledFrame(index, timestamp, image, decode_ms)
+                while next_sample <= timestamp:
+                    next_sample += interval_s
+                decode_start = time.perf_counter()
+            index += 1
+    finally:
+        container.close()
+
+
+def _adaptive_frames(
+    candidates: Iterator[SampledFrame],
+    window_s: Optional[float],
+    budget: int,
+) -> Iterator[SampledFrame]:
+    """Keep the dense candidate frames that differ from the last kept one
+
+    A candidate is kept when its downscaled grayscale mean absolute difference
+    from the previously kept frame reaches ADAPTIVE_DIFF_THRESHOLD, or when
+    ADAPTIVE_MAX_INTERVAL seconds have passed without a kept frame. A budget
+    spreads at most that many frames over the window by raising the minimum
+    spacing between kept frames.
+    """
+    min_interval = ADAPTIVE_MIN_INTERVAL
+    if budget > 0 and window_s:
+        min_interval = max(min_interval, window_s / budget)
+    max_interval = max(ADAPTIVE_MAX_INTERVAL, min_interval)
+
+    kept = 0
+    last_time = None
+    last_thumb = None
+    skipped_ms = 0.0
+    try:
+        for sample in candidates:
+            if budget > 0 and kept >= budget:
+                break
+            gray = cv2.cvtColor(sample.image, cv2.COLOR_BGR2GRAY)
+            thumb = cv2.resize(gray, _DIFF_SIZE, interpolation=cv2.INTER_AREA)
+
+            if last_time is not None:
+                elapsed = sample.timestamp - last_time
+                if elapsed < min_interval - 1e-6:
+                    skipped_ms += sample.decode_ms
+                    continue
+                if elapsed < max_interval - 1e-6:
+                    diff = cv2.absdiff(thumb, last_thumb).mean()
+                    if diff < ADAPTIVE_DIFF_THRESHOLD:
+                        skipped_ms += sample.decode_ms
+                        continue
+
+            # Decoding the dropped candidates is part of what this frame cost
+            yield sample._replace(decode_ms=sample.decode_ms + skipped_ms)
+            kept += 1
+            skipped_ms = 0.0
+            last_time = sample.timestamp
+            last_thumb = thumb
+    finally:
+        close = getattr(candidates, "close", None)
+        if callable(close):
+            close()
+
+
+def inference_frames(
+    frames: Iterator[SampledFrame], max_side: Optional[int] = None
+) -> Iterator[SampledFrame]:
+    """Downscale sampled frames once for the vision models and add their RGB
+
+    Frames whose longer side exceeds max_side (INFERENCE_MAX_SIDE by default,
+    0 keeps full resolution) are resized with INTER_AREA. Pose landmarks are
+    normalized to the image size, so they do not change with the resolution.
+    The resize and the RGB conversion count towards the frame's decode time.
+    """
+    max_side = INFERENCE_MAX_SIDE if max_side is None else max_side
+    try:
+        for sample in frames:
+            start = time.perf_counter()
+            image = sample.image
+            height, width = image.shape[:2]
+            if max_side > 0 and max(height, width) > max_side:
+                scale = max_side / max(height, width)
+                size = (max(1, round(width * scale)), max(1, round(height * scale)))
+                image = cv2.resize(image, size, interpolation=cv2.INTER_AREA)
+            rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+            prepare_ms = (time.perf_counter() - start) * 1000
+            yield sample._replace(
+                image=image, rgb=rgb, decode_ms=sample.decode_ms + prepare_ms
+            )
+    finally:
+        close = getattr(frames, "close", None)
+        if callable(close):
+            close()
+
+
+def sample_frames(
+    video_path: str,
+    reader: Optional[str] = None,
+    start_s: float = 0.0,
+    end_s: Optional[float] = None,
+    sampling: Optional[str] = None,
+    budget: int = 0,
+) -> Iterator[SampledFrame]:
+    """Decode one frame per second of video, each sampled frame exactly once
+
+    Only the (start_s, end_s) window of the video is read; sample indices and
+    timestamps are relative to start_s, as if the window had been cut out.
+
+    reader selects how frames are pulled out of the container:
+    "seek" sets CAP_PROP_POS_FRAMES before every sample, "grab" reads the
+    stream sequentially and only retrieves sampled frames, "ffmpeg" pipes
+    frames through a decimating select filter, and "pyav" decodes with PyAV
+    and samples by presentation timestamp.
+
+    sampling "adaptive" reads candidates every ADAPTIVE_MIN_INTERVAL seconds
+    instead and keeps them sparsely while the picture is static and densely
+    around movement, at most budget frames (0 = unlimited) for the window.
+    """
+    reader = reader or FRAME_READER
+    sampling = sampling or FRAME_SAMPLING
+    if reader not in FRAME_READERS:
+        raise ValueError(
+            f"Unknown frame reader '{reader}', expected one of {FRAME_READERS}"
+        )
+    if sampling not in FRAME_SAMPLING_MODES:
+        raise ValueError(
+            f"Unknown frame sampling '{sampling}', "
+            f"expected one of {FRAME_SAMPLING_MODES}"
+        )
+
+    read = {
+        "seek": _seek_frames,
+        "grab": _grab_frames,
+        "ffmpeg": _ffmpeg_frames,
+        "pyav": _pyav_frames,
+    }[reader]
+    if sampling == "fixed":
+        return read(video_path, start_s, end_s)
+
+    if end_s is not None:
+        window_s = end_s - start_s
+    else:
+        fps, frame_count, _, _ = _probe(video_path)
+        window_s = frame_count / fps - start_s if frame_count > 0 else None
+    candidates = read(video_path, start_s, end_s, ADAPTIVE_MIN_INTERVAL)
+    return _adaptive_frames(candidates, window_s, budget)
@@ -0,0 +1,169 @@
+import os
+import subprocess
+import tempfile
+import threading
+import time
+from typing import Optional, Tuple
+from urllib.parse import urlparse
+
+import requests
+from core.config import (
+    INGEST_CHUNK_SIZE,
+    INGEST_MAX_RETRIES,
+    INGEST_POOL_SIZE,
+    INGEST_TIMEOUT_SECONDS,
+)
+from requests.adapters import HTTPAdapter
+
+from ..logger import get_logger
+from .video_utils import extract_audio
+
+logger = get_logger("ingest")
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+
+def get_session() -> requests.Session:
+    """Shared HTTP session so repeated downloads reuse pooled connections"""
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=INGEST_POOL_SIZE, pool_maxsize=INGEST_POOL_SIZE
+            )
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            _session = session
+        return _session
+
+
+def _start_audio_pipe(audio_path: str) -> subprocess.Popen:
+    """ffmpeg that decodes 16 kHz mono float32 PCM from whatever is written to stdin"""
+    cmd = [
+        "ffmpeg",
+        "-v",
+        "error",
+        "-i",
+        "pipe:0",
+        "-vn",
+        "-acodec",
+        "pcm_f32le",
+        "-ar",
+        "16000",
+        "-ac",
+        "1",
+        "-f",
+        "f32le",
+        audio_path,
+        "-y",
+    ]
+    return subprocess.Popen(
+        cmd,
+        stdin=subprocess.PIPE,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+
+
+def stream_ingest(url: str) -> Tuple[str, str]:
+    """Download a recording while piping it into ffmpeg for audio extraction
+
+    The HTTP body is written to a temp file and, as it arrives, to an ffmpeg
+    process that decodes the audio track, so demuxing overlaps the transfer.
+    Interrupted transfers resume with a Range request. Containers ffmpeg cannot
+    read from a pipe (e.g. MP4 with the moov atom at the end) fall back to
+    extract_audio on the finished file. Returns (video_path, audio_path).
+    """
+    logger.info(f"Streaming video from {url}")
+    parsed_url = urlparse(url)
+    extension = os.path.basename(parsed_url.path).split(".")[-1].lower()
+    if extension not in ["mp4", "webm"]:
+        raise Exception("Unsupported video format")
+
+    with tempfile.NamedTemporaryFile(suffix=f".{extension}", delete=False) as f:
+        video_path = f.name
+    with tempfile.NamedTemporaryFile(suffix=".f32", delete=False) as f:
+        audio_path = f.name
+
+    start = time.perf_counter()
+    ffmpeg = _start_audio_pipe(audio_path)
+    piping = True
+    written = 0
+    attempt = 0
+
+    try:
+        with open(video_path, "wb") as video_file:
+            while True:
+                headers = {"Range": f"bytes={written}-"} if written else {}
+                try:
+                    with get_session().get(
+                        url,
+                        stream=True,
+                        headers=headers,
+                        timeout=INGEST_TIMEOUT_SECONDS,
+                    ) as response:
+                        response.raise_for_status()
+                        if written and response.status_code != 206:
+                            # Server ignored the range: restart from scratch, and
+                            # let the audio fall back to the finished file
+                            logger.info("Range not supported, restarting download")
+                            video_file.seek(0)
+                            video_file.truncate()
+                            written = 0
+                            piping = False
+
+                        for chunk in response.iter_content(
+                            chunk_size=INGEST_CHUNK_SIZE
+                        ):
+                            video_file.write(chunk)
+                            written += len(chunk)
+                            if piping:
+                                try:
+                                    ffmpeg.stdin.write(chunk)
+                                except (BrokenPipeError, OSError):
+                                    piping = False
+                    break
+                except (
+                    requests.ConnectionError,
+                    requests.Timeout,
+                    requests.exceptions.ChunkedEncodingError,
+                ) as e:
+                    attempt += 1
+                    if attempt > INGEST_MAX_RETRIES:
+                        raise
+                    logger.info(
+                        f"Transfer interrupted at {written} bytes ({str(e)}), "
+                        f"resuming (attempt {attempt}/{INGEST_MAX_RETRIES})"
+                    )
+                    time.sleep(min(2**attempt, 30))
+
+        try:
+            ffmpeg.stdin.close()
+        except (BrokenPipeError, OSError):
+            piping = False
+        if ffmpeg.wait() != 0:
+            piping = False
+
+        download_seconds = time.perf_counter() - start
+        if not piping:
+            logger.info("Audio pipe failed, extracting audio from downloaded file")
+            os.unlink(audio_path)
+            audio_path = extract_audio(video_path)
+
+        logger.info(
+            f"Ingested {written} bytes in {download_seconds:.2f}s "
+            f"(audio {'streamed' if piping else 'extracted after download'})"
+        )
+        return video_path, audio_path
+
+    except Exception as e:
+        logger.error(f"Failed to ingest video: {str(e)}")
+        if ffmpeg.poll() is None:
+            ffmpeg.kill()
+            ffmpeg.wait()
+        for path in (video_path, audio_path):
+            if os.path.exists(path):
+                os.unlink(path)
+        raise
@@ -1,4 +1,4 @@
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Tuple
 
 from ..logger import get_logger
 
@@ -156,3 +156,35 @@ def estimate_confidence(
     except Exception as e:
         logger.error(f"Failed to estimate confidence: {str(e)}")
         return {"score": 0.5, "confidence": 0.0}
+
+
+def build_metrics(
+    audio_data: Dict[str, Any],
+    emotion_data: Dict[str, Any],
+    posture_data: Dict[str, Any],
+) -> Tuple[Dict[str, float], Dict[str, float]]:
+    """The metrics and metricsConfidence blocks of a question result
+
+    Only needs the raw analyzer outputs, so stored features can be rescored
+    (see processor/rescore.py) without running any model again.
+    """
+    engagement = compute_engagement(posture_data, audio_data)
+    emotional_tone = compute_emotional_tone(emotion_data, audio_data["text"])
+    speech_clarity = compute_speech_clarity(audio_data, audio_data)
+    confidence = estimate_confidence(posture_data, audio_data)
+
+    metrics = {
+        "speechClarity": speech_clarity["score"],
+        "confidence": confidence["score"],
+        "emotionalTone": emotional_tone["score"],
+        "engagement": engagement["score"],
+        "bodyLanguage": posture_data.get("posture", 0.0),
+    }
+    metrics_confidence = {
+        "speechClarity": speech_clarity["confidence"],
+        "confidence": confidence["confidence"],
+        "emotionalTone": emotional_tone["confidence"],
+        "engagement": engagement["confidence"],
+        "bodyLanguage": posture_data.get("detection_confidence", 0.0),
+    }
+    return metrics, metrics_confidence
@@ -0,0 +1,331 @@
+import atexit
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, List, Optional
+
+from core.config import (
+    MODEL_IDLE_TTL_SECONDS,
+    MODEL_MEMORY_LIMIT_MB,
+    POSE_MODEL,
+    WHISPER_COMPUTE_TYPE,
+    WHISPER_CPU_THREADS,
+    WHISPER_DEVICE,
+    WHISPER_MODEL_SIZE,
+    WHISPER_NUM_WORKERS,
+)
+
+from ..logger import get_logger
+
+logger = get_logger("model-registry")
+
+
+def current_rss_mb() -> float:
+    """Resident set size of this process in MB (0.0 if it cannot be read)"""
+    try:
+        with open("/proc/self/statm") as f:
+            resident_pages = int(f.read().split()[1])
+        return resident_pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except Exception:
+        try:
+            import resource
+
+            # ru_maxrss is in KB on Linux; it is a peak, but better than nothing
+            return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+        except Exception:
+            return 0.0
+
+
+class ModelRegistry:
+    """Process-wide cache of loaded models, keyed by their load parameters"""
+
+    def __init__(
+        self,
+        memory_limit_mb: float = MODEL_MEMORY_LIMIT_MB,
+        idle_ttl_seconds: float = MODEL_IDLE_TTL_SECONDS,
+    ):
+        self.memory_limit_mb = memory_limit_mb
+        self.idle_ttl_seconds = idle_ttl_seconds
+        self._lock = threading.Lock()
+        self._key_locks: Dict[Hashable, threading.Lock] = {}
+        self._models: Dict[Hashable, Any] = {}
+        self._stats: Dict[Hashable, Dict[str, Any]] = {}
+
+    def get(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        """Return the model for key, loading it with loader() on first use"""
+        self.evict_idle(keep=key)
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        # Per-key lock so two threads asking for the same model load it once,
+        # while loads of different models do not block each other
+        with key_lock:
+            with self._lock:
+                if key in self._models:
+                    stats = self._stats[key]
+                    stats["hits"] += 1
+                    stats["last_used"] = time.time()
+                    return self._models[key]
+
+            self._evict_for_memory(keep=key)
+
+            rss_before = current_rss_mb()
+            load_start = time.perf_counter()
+            model = loader()
+            load_seconds = time.perf_counter() - load_start
+            rss_after = current_rss_mb()
+
+            with self._lock:
+                self._models[key] = model
+                self._stats[key] = {
+                    "load_seconds": round(load_seconds, 3),
+                    "memory_mb": round(max(0.0, rss_after - rss_before), 1),
+                    "loaded_at": time.time(),
+                    "last_used": time.time(),
+                    "hits": 0,
+                }
+            logger.info(
+                f"Loaded model {key} in {load_seconds:.2f}s "
+                f"(+{rss_after - rss_before:.0f} MB, rss {rss_after:.0f} MB)"
+            )
+            return model
+
+    def evict(self, key: Hashable) -> bool:
+        """Drop a model from the cache; returns False if it was not loaded"""
+        with self._lock:
+            model = self._models.pop(key, None)
+            self._stats.pop(key, None)
+        if model is None:
+            return False
+        close = getattr(model, "close", None)
+        if callable(close):
+            try:
+                close()
+            except Exception as e:
+                logger.error(f"Failed to close model {key}: {str(e)}")
+        logger.info(f"Evicted model {key}")
+        return True
+
+    def evict_idle(
+        self, max_idle_seconds: Optional[float] = None, keep: Optional[Hashable] = None
+    ) -> List[Hashable]:
+        """Evict every model (except keep) not used for max_idle_seconds"""
+        ttl = self.idle_ttl_seconds if max_idle_seconds is None else max_idle_seconds
+        if ttl <= 0:
+            return []
+        now = time.time()
+        with self._lock:
+            stale = [
+                k
+                for k, s in self._stats.items()
+                if k != keep and now - s["last_used"] > ttl
+            ]
+        return [k for k in stale if self.evict(k)]
+
+    def _evict_for_memory(self, keep: Hashable) -> None:
+        """Evict least recently used models while the process is over budget"""
+        if self.memory_limit_mb <= 0:
+            return
+        while current_rss_mb() > self.memory_limit_mb:
+            with self._lock:
+                candidates = sorted(
+                    (s["last_used"], k) for k, s in self._stats.items() if k != keep
+                )
+            if not candidates:
+                return
+            logger.info(
+                f"RSS above {self.memory_limit_mb} MB, evicting {candidates[0][1]}"
+            )
+            self.evict(candidates[0][1])
+
+    def metrics(self) -> Dict[str, Any]:
+        """Load time, memory and usage counters for every cached model"""
+        with self._lock:
+            models = [
+                {"key": list(k) if isinstance(k, tuple) else k, **s}
+                for k, s in self._stats.items()
+            ]
+        with _pose_pools_lock:
+            pools = [pool.metrics() for pool in _pose_pools.values()]
+        return {
+            "rss_mb": round(current_rss_mb(), 1),
+            "memory_limit_mb": self.memory_limit_mb,
+            "models": models,
+            "pools": pools,
+        }
+
+
+class ModelPool:
+    """Checkout pool for models that must not be shared between threads
+
+    Each caller gets an instance to itself until it checks it back in, so at
+    most one instance exists per concurrently running caller, and graphs are
+    built once and reused rather than per call. reset, if given, clears an
+    instance's per-caller state on checkin; an instance it fails on is dropped.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        factory: Callable[[], Any],
+        reset: Optional[Callable[[Any], None]] = None,
+    ):
+        self.name = name
+        self._factory = factory
+        self._reset = reset
+        self._lock = threading.Lock()
+        self._idle: List[Any] = []
+        self._created = 0
+
+    def checkout(self) -> Any:
+        with self._lock:
+            if self._idle:
+                return self._idle.pop()
+            self._created += 1
+        logger.info(f"Creating {self.name} instance #{self._created}")
+        return self._factory()
+
+    def checkin(self, model: Any) -> None:
+        if self._reset is not None:
+            try:
+                self._reset(model)
+            except Exception as e:
+                logger.error(f"Failed to reset {self.name}, dropping it: {str(e)}")
+                with self._lock:
+                    self._created -= 1
+                try:
+                    model.close()
+                except Exception:
+                    pass
+                return
+        with self._lock:
+            self._idle.append(model)
+
+    def close(self) -> None:
+        """Release the native resources of every idle instance"""
+        with self._lock:
+            idle, self._idle = self._idle, []
+            self._created -= len(idle)
+        for model in idle:
+            try:
+                model.close()
+            except Exception as e:
+                logger.error(f"Failed to close {self.name}: {str(e)}")
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "name": self.name,
+                "created": self._created,
+                "idle": len(self._idle),
+            }
+
+
+registry = ModelRegistry()
+_pose_pools: Dict[str, ModelPool] = {}
+_pose_pools_lock = threading.Lock()
+
+
+def _create_pose_model(mode: str):
+    import mediapipe as mp
+
+    if mode == "pose":
+        # Only pose landmarks are used downstream; skips the face and hand models
+        return mp.solutions.pose.Pose(
+            min_detection_confidence=0.5, min_tracking_confidence=0.5
+        )
+    if mode == "holistic":
+        return mp.solutions.holistic.Holistic(
+            min_detection_confidence=0.5, min_tracking_confidence=0.5
+        )
+    raise ValueError(f"Unknown pose model '{mode}', expected 'pose' or 'holistic'")
+
+
+def get_pose_pool(mode: Optional[str] = None) -> ModelPool:
+    """Pool of MediaPipe Pose/Holistic graphs for the given mode"""
+    mode = mode or POSE_MODEL
+    with _pose_pools_lock:
+        if mode not in _pose_pools:
+            # Graphs run in tracking mode: without a reset the next question,
+            # possibly of another interview, would start from this one's
+            # landmark ROI and smoothing state
+            _pose_pools[mode] = ModelPool(
+                f"mediapipe-{mode}",
+                lambda: _create_pose_model(mode),
+                reset=lambda model: model.reset(),
+            )
+        return _pose_pools[mode]
+
+
+@atexit.register
+def close_pose_pools() -> None:
+    with _pose_pools_lock:
+        pools = list(_pose_pools.values())
+    for pool in pools:
+        pool.close()
+
+
+def get_whisper_model(
+    model_size: str = WHISPER_MODEL_SIZE,
+    compute_type: str = WHISPER_COMPUTE_TYPE,
+    device: str = WHISPER_DEVICE,
+    cpu_threads: int = WHISPER_CPU_THREADS,
+    num_workers: int = WHISPER_NUM_WORKERS,
+):
+    """Cached faster-whisper model for its size, compute type, device and threads"""
+
+    def load():
+        from faster_whisper import WhisperModel
+
+        return WhisperModel(
+            model_size,
+            device=device,
+            compute_type=compute_type,
+            cpu_threads=cpu_threads,
+            num_workers=num_workers,
+        )
+
+    return registry.get(
+        ("whisper", model_size, compute_type, device, cpu_threads, num_workers), load
+    )
+
+
+def get_batched_whisper_pipeline(**model_kwargs):
+    """faster-whisper BatchedInferencePipeline around the cached model"""
+
+    def load():
+        from faster_whisper import BatchedInferencePipeline
+
+        return BatchedInferencePipeline(model=get_whisper_model(**model_kwargs))
+
+    key = tuple(sorted(model_kwargs.items()))
+    return registry.get(("whisper-batched",) + key, load)
+
+
+def warmup_models(whisper: bool = True, vision: bool = True) -> None:
+    """Load the default models up front so the first job does not pay for it
+
+    whisper covers the default transcription profile; vision the DeepFace
+    emotion model, its face detector and a MediaPipe pose graph.
+    """
+    if whisper:
+        try:
+            # Imported here: audio_utils itself depends on this module
+            from .audio_utils import resolve_transcription_profile
+
+            get_whisper_model(**resolve_transcription_profile().model_kwargs())
+        except Exception as e:
+            logger.error(f"Whisper warmup failed: {str(e)}")
+    if vision:
+        try:
+            import numpy as np
+
+            from .emotion_engine import detect_faces, get_emotion_model
+
+            get_emotion_model()
+            # DeepFace builds and caches its detector on the first call
+            detect_faces(np.zeros((64, 64, 3), dtype=np.uint8))
+            pool = get_pose_pool()
+            pool.checkin(pool.checkout())
+        except Exception as e:
+            logger.error(f"Vision model warmup failed: {str(e)}")
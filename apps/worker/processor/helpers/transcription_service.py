@@ -0,0 +1,199 @@
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+from core.config import (
+    TRANSCRIBE_MAX_CLIPS,
+    TRANSCRIBE_MAX_WAIT_MS,
+    WHISPER_BATCH_SIZE,
+)
+
+from ..logger import get_logger
+from .audio_utils import (
+    SAMPLE_RATE,
+    TranscriptionProfile,
+    open_pcm,
+    pcm_window,
+    resolve_transcription_profile,
+    segment_dicts,
+    split_segments,
+    summarize_segments,
+)
+from .model_registry import get_batched_whisper_pipeline
+
+logger = get_logger("transcription")
+
+
+class _Clip(NamedTuple):
+    samples: np.ndarray
+    future: Future
+    submitted: float
+
+
+class BatchedTranscriber:
+    """Transcribes audio clips submitted from any thread in shared batches
+
+    Clips with the same transcription profile are concatenated and run through
+    faster-whisper's BatchedInferencePipeline in one call; the word-timestamped
+    segments are then split back per clip. A batch
+    starts once max_clips clips are waiting or the oldest has waited
+    max_wait_ms, which bounds the latency batching adds to a single answer.
+    """
+
+    def __init__(
+        self,
+        max_clips: int = TRANSCRIBE_MAX_CLIPS,
+        max_wait_ms: int = TRANSCRIBE_MAX_WAIT_MS,
+        batch_size: int = WHISPER_BATCH_SIZE,
+    ):
+        self.max_clips = max(1, max_clips)
+        self.max_wait_ms = max_wait_ms
+        self.batch_size = batch_size
+        self._pending: Dict[TranscriptionProfile, List[_Clip]] = {}
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self.batches = 0
+        self.clips = 0
+
+    def submit(
+        self, samples: np.ndarray, profile: Optional[TranscriptionProfile] = None
+    ) -> Future:
+        """Queue 16 kHz mono samples; the future resolves to segment dicts"""
+        profile = profile or resolve_transcription_profile()
+        future: Future = Future()
+        with self._cond:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="transcription", daemon=True
+                )
+                self._thread.start()
+            clip = _Clip(samples, future, time.perf_counter())
+            self._pending.setdefault(profile, []).append(clip)
+            self._cond.notify()
+        return future
+
+    def _next_batch(self) -> Tuple[TranscriptionProfile, List[_Clip]]:
+        """Block until some profile's clips are due, then take them"""
+        with self._cond:
+            while True:
+                now = time.perf_counter()
+                wait = None
+                for profile, clips in self._pending.items():
+                    due = clips[0].submitted + self.max_wait_ms / 1000.0
+                    if len(clips) >= self.max_clips or due <= now:
+                        batch = clips[: self.max_clips]
+                        rest = clips[self.max_clips :]
+                        if rest:
+                            self._pending[profile] = rest
+                        else:
+                            del self._pending[profile]
+                        return profile, batch
+                    wait = due - now if wait is None else min(wait, due - now)
+                self._cond.wait(wait)
+
+    def _run(self):
+        while True:
+            profile, clips = self._next_batch()
+            try:
+                results = self._transcribe(profile, [c.samples for c in clips])
+            except Exception as e:
+                for clip in clips:
+                    clip.future.set_exception(e)
+                continue
+            for clip, segments in zip(clips, results):
+                clip.future.set_result(segments)
+
+    def _transcribe(
+        self, profile: TranscriptionProfile, clips: List[np.ndarray]
+    ) -> List[List[Dict[str, Any]]]:
+        from faster_whisper.vad import VadOptions, get_speech_timestamps, merge_segments
+
+        start = time.perf_counter()
+        pipeline = get_batched_whisper_pipeline(**profile.model_kwargs())
+        # The pipeline's own VAD settings, but run per clip: over the joined
+        # audio it would merge speech of neighbouring clips into one chunk
+        vad = VadOptions(
+            max_speech_duration_s=pipeline.model.feature_extractor.chunk_length,
+            min_silence_duration_ms=160,
+        )
+        windows = []
+        chunks = []
+        offset = 0
+        for samples in clips:
+            samples = samples.astype(np.float32, copy=False)
+            windows.append(
+                (offset / SAMPLE_RATE, (offset + len(samples)) / SAMPLE_RATE)
+            )
+            if len(samples):
+                speech = get_speech_timestamps(samples, vad, SAMPLE_RATE)
+                for chunk in merge_segments(speech, vad, SAMPLE_RATE):
+                    chunks.append(
+                        {"start": offset + chunk["start"], "end": offset + chunk["end"]}
+                    )
+            offset += len(samples)
+
+        if not chunks:
+            # No speech anywhere; an empty clip_timestamps would re-run VAD
+            return [[] for _ in clips]
+
+        segments, info = pipeline.transcribe(
+            np.concatenate(clips).astype(np.float32, copy=False),
+            language=profile.language,
+            beam_size=profile.beam_size,
+            word_timestamps=True,
+            clip_timestamps=chunks,
+            # Timestamped segments within each chunk, as sequential decoding
+            # returns; pause detection relies on the gaps between them
+            without_timestamps=False,
+            batch_size=self.batch_size,
+        )
+        buckets = split_segments(segment_dicts(segments), windows)
+
+        self.batches += 1
+        self.clips += len(clips)
+        logger.info(
+            f"Transcribed {len(clips)} clip(s), {offset / SAMPLE_RATE:.1f}s of "
+            f"audio, in {time.perf_counter() - start:.2f}s"
+        )
+        return buckets
+
+
+_transcriber: Optional[BatchedTranscriber] = None
+_transcriber_lock = threading.Lock()
+
+
+def get_transcriber() -> BatchedTranscriber:
+    """Process-wide transcriber shared by every question and interview"""
+    global _transcriber
+    with _transcriber_lock:
+        if _transcriber is None:
+            _transcriber = BatchedTranscriber()
+        return _transcriber
+
+
+def analyze_interview_audio_batched(
+    audio_path: str,
+    windows: Sequence[Tuple[float, float]],
+    profile: Optional[TranscriptionProfile] = None,
+) -> List[dict]:
+    """Like analyze_interview_audio, but each window is a clip in a shared batch
+
+    All windows are queued at once, so an interview's answers batch with each
+    other and with clips other pipeline threads submitted meanwhile.
+    """
+    try:
+        profile = profile or resolve_transcription_profile()
+        pcm = open_pcm(audio_path)
+        clips = [pcm_window(pcm, start_s, end_s) for start_s, end_s in windows]
+        transcriber = get_transcriber()
+        futures = [transcriber.submit(clip, profile) for clip in clips]
+        return [
+            summarize_segments(future.result(), clip, profile.language)
+            for future, clip in zip(futures, clips)
+        ]
+
+    except Exception as e:
+        print(f"Error in analyze_interview_audio_batched: {e}")
+        raise Exception(f"Audio analysis failed: {str(e)}")
@@ -1,9 +1,9 @@
+import json
 import os
 import subprocess
 import tempfile
-from urllib.parse import urlparse
-
-import requests
+import time
+from typing import Any, Dict, Tuple
 
 from ..logger import get_logger
 
@@ -33,48 +33,84 @@ def convert_webm_to_mp4(input_path: str, output_path: str):
         raise Exception(f"Failed to convert WebM to MP4: {str(e)}")
 
 
-def download_video(url: str) -> str:
-    """Download video and ensure it's MP4 format"""
-    logger.info(f"Downloading video from {url}")
+def probe_video(video_path: str) -> Dict[str, Any]:
+    """Container duration and stream codecs as reported by ffprobe"""
+    cmd = [
+        "ffprobe",
+        "-v",
+        "error",
+        "-show_entries",
+        "format=duration:stream=codec_type,codec_name",
+        "-of",
+        "json",
+        video_path,
+    ]
+    output = subprocess.run(cmd, check=True, capture_output=True).stdout
+    info = json.loads(output or b"{}")
+    duration = info.get("format", {}).get("duration")
+    return {
+        # MediaRecorder webm files are written without a duration or cues
+        "duration": float(duration) if duration not in (None, "N/A") else None,
+        "streams": {
+            s.get("codec_type"): s.get("codec_name") for s in info.get("streams", [])
+        },
+    }
+
+
+def is_seekable(video_path: str) -> bool:
+    """Whether the container carries the duration/index needed to seek into it"""
     try:
-        # Detect extension
-        parsed_url = urlparse(url)
-        filename = os.path.basename(parsed_url.path)
-        extension = filename.split(".")[-1].lower()
-        if extension not in ["mp4", "webm"]:
-            raise Exception("Unsupported video format")
-
-        # Download original
-        with tempfile.NamedTemporaryFile(
-            suffix=f".{extension}", delete=False
-        ) as temp_file:
-            video_path = temp_file.name
-
-        response = requests.get(url, stream=True)
-        response.raise_for_status()
-        with open(video_path, "wb") as f:
-            for chunk in response.iter_content(chunk_size=8192):
-                f.write(chunk)
-
-        # If webm → convert
-        if extension == "webm":
-            mp4_path = video_path.replace(".webm", ".mp4")
-            convert_webm_to_mp4(video_path, mp4_path)
-            os.unlink(video_path)  # delete original webm
-            return mp4_path
-
-        return video_path
+        info = probe_video(video_path)
+        return bool(info["duration"]) and "video" in info["streams"]
+    except Exception as e:
+        logger.error(f"Failed to probe {video_path}: {str(e)}")
+        return False
+
 
+def remux_video(input_path: str, output_path: str):
+    """Rewrite the container without re-encoding so it gets a duration and cues"""
+    try:
+        cmd = ["ffmpeg", "-i", input_path, "-c", "copy", output_path, "-y"]
+        subprocess.run(cmd, check=True, capture_output=True)
+        logger.info(f"Remuxed {input_path} to {output_path}")
     except Exception as e:
-        logger.error(f"Failed to download video: {str(e)}")
-        if "video_path" in locals() and os.path.exists(video_path):
-            os.unlink(video_path)
-        raise
+        raise Exception(f"Failed to remux video: {str(e)}")
+
+
+def prepare_video(video_path: str) -> Tuple[str, Dict[str, Any]]:
+    """Make a recording ready for analysis doing as little work as possible
+
+    WebM is analyzed as is when it can be seeked; otherwise it is remuxed into
+    Matroska (stream copy, no decode), and only transcoded to MP4 when neither
+    gives a seekable file. Returns the path to analyze and how it was prepared.
+    """
+    start = time.perf_counter()
+    method = "direct"
+    path = video_path
+
+    if video_path.endswith(".webm") and not is_seekable(video_path):
+        path = video_path[: -len(".webm")] + ".mkv"
+        method = "remux"
+        try:
+            remux_video(video_path, path)
+            if not is_seekable(path):
+                raise Exception("remuxed file is still not seekable")
+        except Exception as e:
+            logger.info(f"Falling back to transcode for {video_path}: {str(e)}")
+            if os.path.exists(path):
+                os.unlink(path)
+            path = video_path[: -len(".webm")] + ".mp4"
+            method = "transcode"
+            convert_webm_to_mp4(video_path, path)
+
+    seconds = round(time.perf_counter() - start, 2)
+    logger.info(f"Prepared {video_path} via {method} in {seconds}s")
+    return path, {"method": method, "seconds": seconds}
 
 
 def extract_audio(video_path: str) -> str:
-    """Extract audio from video file and return path to audio file"""
-    with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as temp_file:
+    """Decode the audio track once to raw 16 kHz mono float32 PCM (see open_pcm)"""
+    with tempfile.NamedTemporaryFile(suffix=".f32", delete=False) as temp_file:
         audio_path = temp_file.name
     try:
         # Use ffmpeg to extract audio
@@ -86,11 +122,13 @@ def extract_audio(video_path: str) -> str:
             video_path,
             "-vn",
             "-acodec",
-            "pcm_s16le",
+            "pcm_f32le",
             "-ar",
             "16000",
             "-ac",
             "1",
+            "-f",
+            "f32le",
             audio_path,
             "-y",
         ]
@@ -102,66 +140,4 @@ def extract_audio(video_path: str) -> str:
         raise Exception(f"Failed to extract audio: {str(e)}")
 
 
-import subprocess
-
-
-def slice_video(
-    video_path: str, start_time_ms: float, end_time_ms: float, output_path: str
-) -> None:
-    """Slice a segment from a video file with accurate timing"""
-    try:
-        start_sec = start_time_ms
-        duration = end_time_ms - start_time_ms
-
-        cmd = [
-            "ffmpeg",
-            "-ss",
-            str(start_sec),
-            "-i",
-            video_path,
-            "-t",
-            str(duration),
-            "-c:v",
-            "libx264",
-            "-c:a",
-            "aac",
-            "-preset",
-            "veryfast",
-            output_path,
-            "-y",
-        ]
-        subprocess.run(cmd, check=True)
-        print(f"✅ Sliced video saved to {output_path}")
-    except subprocess.CalledProcessError as e:
-        print(e.stderr.decode())
-        raise Exception(f"FFmpeg failed: {str(e)}")
-    except Exception as e:
-        raise Exception(f"Failed to slice video: {str(e)}")
-
-
-def slice_audio(
-    audio_path: str, start_time: float, end_time: float, output_path: str
-) -> None:
-    """Slice a segment from an audio file"""
-    try:
-        import subprocess
-
-        cmd = [
-            "ffmpeg",
-            "-i",
-            audio_path,
-            "-ss",
-            str(start_time),
-            "-to",
-            str(end_time),
-            "-c:a",
-            "copy",
-            output_path,
-            "-y",
-        ]
-        subprocess.run(cmd, check=True, capture_output=True)
-    except Exception as e:
-        raise Exception(f"Failed to slice audio: {str(e)}")
-
-
 # Audio processing functions
@@ -1,154 +0,0 @@
-# ✅ Updated analyze_emotions() and analyze_body_language()
-
-import os
-import tempfile
-from collections import defaultdict
-
-import cv2
-import mediapipe as mp
-import numpy as np
-from deepface import DeepFace
-
-# Ensure DEEPFACE_HOME is set before DeepFace is imported elsewhere
-if "DEEPFACE_HOME" not in os.environ:
-    os.environ["DEEPFACE_HOME"] = "/app/.deepface"
-
-
-def analyze_emotions(video_path: str, with_timeline: bool = False) -> dict:
-    cap = cv2.VideoCapture(video_path)
-    fps = cap.get(cv2.CAP_PROP_FPS) or 25
-    frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-    sample_rate = int(fps)
-
-    emotion_totals = defaultdict(float)
-    emotion_counts = 0
-    timeline = []
-
-    for frame_idx in range(0, frame_count, sample_rate):
-        cap.set(cv2.CAP_PROP_POS_FRAMES, frame_idx)
-        ret, frame = cap.read()
-        if not ret:
-            continue
-        with tempfile.NamedTemporaryFile(suffix=".jpg", delete=False) as temp_file:
-            frame_path = temp_file.name
-            cv2.imwrite(frame_path, frame)
-        try:
-            analysis = DeepFace.analyze(
-                img_path=frame_path,
-                actions=["emotion"],
-                enforce_detection=False,
-                detector_backend="mediapipe",
-            )
-            if isinstance(analysis, list):
-                analysis = analysis[0]
-            scores = analysis["emotion"]
-            for emotion, score in scores.items():
-                emotion_totals[emotion] += score
-            emotion_counts += 1
-
-            if with_timeline:
-                timestamp = frame_idx / fps
-                dominant = max(scores.items(), key=lambda x: x[1])[0]
-                timeline.append({"timestamp": round(timestamp, 2), "emotion": dominant})
-
-        except Exception:
-            pass
-        finally:
-            os.unlink(frame_path)
-
-    cap.release()
-
-    if emotion_counts == 0:
-        return {"dominant_emotion": None, "top_emotions": {}, "timeline": []}
-
-    avg_scores = {e: round(t / emotion_counts, 2) for e, t in emotion_totals.items()}
-    top_emotions = dict(
-        sorted(avg_scores.items(), key=lambda x: x[1], reverse=True)[:5]
-    )
-    dominant_emotion = next(iter(top_emotions))
-
-    return {
-        "dominant_emotion": dominant_emotion,
-        "top_emotions": top_emotions,
-        "timeline": timeline if with_timeline else [],
-    }
-
-
-def analyze_body_language(video_path: str, with_timeline: bool = False) -> dict:
-    mp_holistic = mp.solutions.holistic
-    holistic = mp_holistic.Holistic(
-        min_detection_confidence=0.5, min_tracking_confidence=0.5
-    )
-    cap = cv2.VideoCapture(video_path)
-    fps = cap.get(cv2.CAP_PROP_FPS) or 25
-    frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-    sample_rate = int(fps)
-
-    pose_history = []
-    face_history = []
-    gesture_count = 0
-    movement_energy = 0.0
-    prev_pose = None
-    timeline = []
-    gaze_timeline = []
-    expressiveness_timeline = []
-
-    for frame_idx in range(0, frame_count, sample_rate):
-        cap.set(cv2.CAP_PROP_POS_FRAMES, frame_idx)
-        ret, frame = cap.read()
-        if not ret:
-            continue
-        rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        results = holistic.process(rgb)
-
-        if results.pose_landmarks:
-            pose = [(lm.x, lm.y, lm.z) for lm in results.pose_landmarks.landmark]
-            pose_history.append(pose)
-
-            if prev_pose:
-                movement = sum(
-                    np.linalg.norm(np.array(p) - np.array(c))
-                    for p, c in zip(prev_pose, pose)
-                )
-                movement_energy += movement
-                if movement > 0.1:
-                    gesture_count += 1
-            prev_pose = pose
-
-        if results.face_landmarks:
-            face = [(lm.x, lm.y, lm.z) for lm in results.face_landmarks.landmark]
-            face_history.append(face)
-
-        if with_timeline:
-            timestamp = frame_idx / fps
-            gaze = 0.85  # Placeholder
-            posture = 0.7  # Placeholder
-            gesture = "nodding" if gesture_count > 0 else "none"
-            timeline.append(
-                {
-                    "timestamp": round(timestamp, 2),
-                    "eyeGaze": gaze,
-                    "posture": posture,
-                    "gesture": gesture,
-                }
-            )
-            gaze_timeline.append({"timestamp": round(timestamp, 2), "eyeGaze": gaze})
-            expressiveness_timeline.append(
-                {"timestamp": round(timestamp, 2), "score": 0.75}
-            )
-
-    cap.release()
-
-    if pose_history:
-        movement_energy /= len(pose_history)
-
-    return {
-        "eyeGaze": 0.85,
-        "posture": 0.7,
-        "gesture_count": gesture_count,
-        "movement_energy": movement_energy,
-        "detection_confidence": 0.85 if pose_history else 0.0,
-        "timeline": timeline if with_timeline else [],
-        "gaze_timeline": gaze_timeline if with_timeline else [],
-        "expressiveness_timeline": expressiveness_timeline if with_timeline else [],
-    }
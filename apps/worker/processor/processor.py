@@ -1,25 +1,45 @@
 # ✅ Final Clean & Working process_interview() with webm handling
 
+import asyncio
 import os
 import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime
+from typing import Optional
+
+from core.config import (
+    FEATURE_STORE_ENABLED,
+    FRAME_BUDGET,
+    FRAME_SAMPLING,
+    PIPELINE_THREADS,
+    TRANSCRIPTION_MODE,
+    WEBM_FRAME_READER,
+)
 
-from .helpers.audio_utils import analyze_audio
-from .helpers.metrics import (
-    compute_emotional_tone,
-    compute_engagement,
-    compute_speech_clarity,
-    estimate_confidence,
+from .helpers.audio_utils import (
+    TranscriptionProfile,
+    analyze_audio,
+    analyze_interview_audio,
+    open_pcm,
+    pcm_window,
+    resolve_transcription_profile,
 )
-from .helpers.video_utils import (
-    convert_webm_to_mp4,
-    download_video,
-    extract_audio,
-    slice_audio,
-    slice_video,
+from .helpers.metrics import build_metrics
+from .helpers.ingest import stream_ingest
+from .helpers.transcription_service import analyze_interview_audio_batched
+from .helpers.video_utils import extract_audio, prepare_video
+from .helpers.frame_sampler import inference_frames, sample_frames
+from .helpers.vision_utils import (
+    BodyLanguageAnalyzer,
+    EmotionAnalyzer,
+    FrameTee,
+    consume_frames,
 )
-from .helpers.vision_utils import analyze_body_language, analyze_emotions
+from .feature_store import get_feature_store
 from .logger import get_logger
+from .question_pool import get_question_pool, reset_question_pool, run_question
+from .stages import run_stages
 
 PROCESSING_VERSION = "v1.1"
 CHUNK_SAVE_DIR = "./chunks"
@@ -40,13 +60,26 @@ except Exception as e:
     logger.error(f"Failed to create directory {CHUNK_SAVE_DIR}: {str(e)}")
 
 
+# ffmpeg, requests, Whisper, DeepFace and MediaPipe all block, so the pipeline
+# runs on its own threads and never on the API's event loop
+_pipeline_executor = ThreadPoolExecutor(
+    max_workers=PIPELINE_THREADS, thread_name_prefix="pipeline"
+)
+
+
 async def process_interview(interview_id: str, metadata: dict) -> dict:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _pipeline_executor, run_interview_pipeline, interview_id, metadata
+    )
+
+
+def run_interview_pipeline(interview_id: str, metadata: dict) -> dict:
     results = []
     error_log = []
     start_time = time.time()
 
     temp_files = []  # Keep track of temp files
-    chunk_files = []  # Keep track of temp files
 
     try:
         video_url = metadata["videoUrl"]
@@ -63,8 +96,6 @@ async def process_interview(interview_id: str, metadata: dict) -> dict:
         #         raise FileNotFoundError(f"Video file not found: {video_path}")
 
         video_path = video_url
-        # if not os.path.exists(video_url):
-        #     video_path = download_video(video_url)
 
         # if video_path.endswith(".webm"):
         #     mp4_path = video_path.replace(".webm", ".mp4")
@@ -74,108 +105,86 @@ async def process_interview(interview_id: str, metadata: dict) -> dict:
         # audio_path = extract_audio(video_path)
 
         downloaded = False
+        audio_path = None
 
         if not os.path.exists(video_url):
-            video_path = download_video(video_url)
+            # Audio is decoded while the recording downloads
+            video_path, audio_path = stream_ingest(video_url)
             downloaded = True
             temp_files.append(video_path)
+            temp_files.append(audio_path)
 
-        if video_path.endswith(".webm"):
-            mp4_path = video_path.replace(".webm", ".mp4")
-            convert_webm_to_mp4(video_path, mp4_path)
-            video_path = mp4_path
-            temp_files.append(mp4_path)
-
-        audio_path = extract_audio(video_path)
-        temp_files.append(audio_path)
-
-        for timestamp in timestamps:
-            question_id = timestamp["questionId"]
-            start_ms = timestamp["start"]
-            end_ms = timestamp["end"]
+        # WebM is decoded directly unless it cannot be seeked (see prepare_video)
+        source_path = video_path
+        video_path, preparation = prepare_video(source_path)
+        if video_path != source_path:
+            temp_files.append(video_path)
 
+        if audio_path is None:
+            audio_path = extract_audio(video_path)
+            temp_files.append(audio_path)
+
+        options = metadata.get("options") or {}
+        frame_reader = options.get("frameReader")
+        if not frame_reader and not video_path.endswith(".mp4"):
+            # MediaRecorder WebM is variable frame rate; sample by timestamp
+            frame_reader = WEBM_FRAME_READER
+        transcription_mode = options.get("transcriptionMode", TRANSCRIPTION_MODE)
+        transcription_profile = resolve_transcription_profile(options)
+        frame_sampling = options.get("frameSampling", FRAME_SAMPLING)
+        frame_budgets = _frame_budgets(
+            timestamps, int(options.get("frameBudget", FRAME_BUDGET))
+        )
+
+        windows = [(t["start"] / 1000.0, t["end"] / 1000.0) for t in timestamps]
+        single_pass_audio = None
+        if transcription_mode == "single_pass":
+            single_pass_audio = analyze_interview_audio(
+                audio_path, windows, transcription_profile
+            )
+        elif transcription_mode == "batched":
+            single_pass_audio = analyze_interview_audio_batched(
+                audio_path, windows, transcription_profile
+            )
+
+        questions = [
+            {
+                "interview_id": interview_id,
+                "timestamp": timestamp,
+                "video_path": video_path,
+                "audio_path": audio_path,
+                "audio_data": (
+                    single_pass_audio[index] if single_pass_audio is not None else None
+                ),
+                "frame_reader": frame_reader,
+                "frame_sampling": frame_sampling,
+                "frame_budget": frame_budgets[index],
+                "transcription_profile": transcription_profile,
+                "preparation": preparation,
+            }
+            for index, timestamp in enumerate(timestamps)
+        ]
+
+        # Questions share nothing, so they fan out over the process pool when
+        # one is configured; results come back in question order either way
+        pool = get_question_pool()
+        if pool is not None:
+            outcomes = [pool.submit(run_question, question) for question in questions]
+        else:
+            outcomes = questions
+
+        for question, outcome in zip(questions, outcomes):
+            question_id = question["timestamp"]["questionId"]
             try:
-                saved_video = os.path.join(
-                    CHUNK_SAVE_DIR, f"{interview_id}_{question_id}.mp4"
-                )
-                saved_audio = os.path.join(
-                    CHUNK_SAVE_DIR, f"{interview_id}_{question_id}.wav"
-                )
-
-                chunk_files.append(saved_video)
-                chunk_files.append(saved_audio)
-
-                slice_video(video_path, start_ms / 1000.0, end_ms / 1000.0, saved_video)
-                slice_audio(audio_path, start_ms / 1000.0, end_ms / 1000.0, saved_audio)
-
-                audio_data = analyze_audio(saved_audio)
-                emotion_data = analyze_emotions(saved_video, with_timeline=True)
-                posture_data = analyze_body_language(saved_video, with_timeline=True)
-
-                engagement_data = compute_engagement(posture_data, audio_data)
-                emotional_tone_data = compute_emotional_tone(
-                    emotion_data, audio_data["text"]
-                )
-                speech_clarity_data = compute_speech_clarity(audio_data, audio_data)
-                confidence_data = estimate_confidence(posture_data, audio_data)
-
-                duration = end_ms - start_ms
-
-                result = {
-                    "questionId": question_id,
-                    "transcript": audio_data["text"],
-                    "start": start_ms,
-                    "end": end_ms,
-                    "duration": duration,
-                    "wordTimings": audio_data.get("word_timings", []),
-                    "emotionTimeline": emotion_data.get("timeline", []),
-                    "postureTimeline": posture_data.get("timeline", []),
-                    "gazeTimeline": posture_data.get("gaze_timeline", []),
-                    "pauseLocations": audio_data.get("pauseLocations", []),
-                    "disfluencies": audio_data.get("disfluencies", []),
-                    "expressivenessTimeline": posture_data.get(
-                        "expressiveness_timeline", []
-                    ),
-                    "expressiveness": round(
-                        sum(
-                            x["score"]
-                            for x in posture_data.get("expressiveness_timeline", [])
-                        )
-                        / (len(posture_data.get("expressiveness_timeline", []) or [1])),
-                        2,
-                    ),
-                    "emotion": emotion_data.get("dominant_emotion"),
-                    "eyeGaze": posture_data.get("eyeGaze", 0.0),
-                    "posture": posture_data.get("posture", 0.0),
-                    "gestures": posture_data.get("gesture_count", 0),
-                    "movement": posture_data.get("movement_energy", 0.0),
-                    "speechFeatures": {
-                        "rate": audio_data.get("words_per_minute", 0),
-                        "volumeVariation": audio_data.get("volume_variation", 0.0),
-                        "pauseCount": audio_data.get("pause_count", 0),
-                        "fillerWords": audio_data.get("filler_words", {}),
-                    },
-                    "metrics": {
-                        "speechClarity": speech_clarity_data["score"],
-                        "confidence": confidence_data["score"],
-                        "emotionalTone": emotional_tone_data["score"],
-                        "engagement": engagement_data["score"],
-                        "bodyLanguage": posture_data.get("posture", 0.0),
-                    },
-                    "metricsConfidence": {
-                        "speechClarity": speech_clarity_data["confidence"],
-                        "confidence": confidence_data["confidence"],
-                        "emotionalTone": emotional_tone_data["confidence"],
-                        "engagement": engagement_data["confidence"],
-                        "bodyLanguage": posture_data.get("detection_confidence", 0.0),
-                    },
-                    "processingVersion": PROCESSING_VERSION,
-                    "qualityFlag": "good",
-                }
-
+                if pool is not None:
+                    result = outcome.result()
+                else:
+                    result = process_question(**question)
                 results.append(result)
-
             except Exception as e:
+                if isinstance(e, BrokenProcessPool):
+                    # A worker died (e.g. OOM); rebuild the pool for the next job
+                    reset_question_pool()
                 results.append(
                     {"questionId": question_id, "error": str(e), "partial": True}
                 )
@@ -204,12 +213,155 @@ async def process_interview(interview_id: str, metadata: dict) -> dict:
             except Exception as cleanup_err:
                 print(f"Failed to remove temp file {file}: {str(cleanup_err)}")
 
-        # Ensure any remaining chunk files are cleaned up
-        for chunk_file in chunk_files:
+
+def _frame_budgets(timestamps: list, job_budget: int) -> list:
+    """Split a job's frame budget over its questions by answer length"""
+    if job_budget <= 0:
+        return [0] * len(timestamps)
+    durations = [max(0, t["end"] - t["start"]) for t in timestamps]
+    total = sum(durations) or 1
+    return [max(1, int(job_budget * d / total)) for d in durations]
+
+
+def process_question(
+    interview_id: str,
+    timestamp: dict,
+    video_path: str,
+    audio_path: str,
+    audio_data: Optional[dict],
+    frame_reader: Optional[str],
+    preparation: dict,
+    frame_sampling: Optional[str] = None,
+    frame_budget: int = 0,
+    transcription_profile: Optional[TranscriptionProfile] = None,
+) -> dict:
+    """Analyze one question window; audio_data is passed in for single-pass mode"""
+    question_id = timestamp["questionId"]
+    start_ms = timestamp["start"]
+    end_ms = timestamp["end"]
+
+    def audio_stage():
+        if audio_data is not None:
+            return audio_data
+        # A view into the interview's memory-mapped PCM, nothing is decoded again
+        samples = pcm_window(open_pcm(audio_path), start_ms / 1000.0, end_ms / 1000.0)
+        return analyze_audio(samples, transcription_profile)
+
+    def scoring_stage(audio_data, emotion_data, posture_data):
+        if FEATURE_STORE_ENABLED:
+            # Raw features first, so a scoring bug can be fixed by rescoring;
+            # a side effect, so a store error must not fail the question
             try:
-                if os.path.exists(chunk_file):
-                    os.remove(chunk_file)
-            except Exception as chunk_cleanup_err:
-                print(
-                    f"Failed to remove chunk file {chunk_file}: {str(chunk_cleanup_err)}"
+                get_feature_store().put(
+                    interview_id,
+                    question_id,
+                    audio_data,
+                    emotion_data,
+                    posture_data,
+                    PROCESSING_VERSION,
+                )
+            except Exception as e:
+                logger.error(
+                    f"Failed to store features of {interview_id}/{question_id}: "
+                    f"{str(e)}"
                 )
+        return build_metrics(audio_data, emotion_data, posture_data)
+
+    # Frames are read straight from the source video's time window, decoded
+    # and downscaled once; the emotion and posture stages consume them as
+    # they come
+    frames = FrameTee(
+        inference_frames(
+            sample_frames(
+                video_path,
+                frame_reader,
+                start_ms / 1000.0,
+                end_ms / 1000.0,
+                sampling=frame_sampling,
+                budget=frame_budget,
+            )
+        ),
+        consumers=2,
+    )
+    emotions = EmotionAnalyzer(with_timeline=True)
+    # One sample per second of answer, plus the first frame
+    body_language = BodyLanguageAnalyzer(
+        with_timeline=True, capacity=int((end_ms - start_ms) / 1000) + 2
+    )
+
+    # Audio, emotion and posture are independent until scoring combines them
+    outputs, stage_timings, critical_path = run_stages(
+        {
+            "audio": (audio_stage, []),
+            "frames": (frames.run, []),
+            "emotion": (lambda: consume_frames(emotions, frames.consume(0)), []),
+            "posture": (
+                lambda: consume_frames(body_language, frames.consume(1)),
+                [],
+            ),
+            "scoring": (scoring_stage, ["audio", "emotion", "posture"]),
+        }
+    )
+    audio_data = outputs["audio"]
+    emotion_data = outputs["emotion"]
+    posture_data = outputs["posture"]
+    metrics, metrics_confidence = outputs["scoring"]
+
+    duration = end_ms - start_ms
+
+    def per_frame(total_ms: float) -> float:
+        return round(total_ms / frames.frames, 2) if frames.frames else 0.0
+
+    result = {
+        "questionId": question_id,
+        "transcript": audio_data["text"],
+        "start": start_ms,
+        "end": end_ms,
+        "duration": duration,
+        "wordTimings": audio_data.get("word_timings", []),
+        "emotionTimeline": emotion_data.get("timeline", []),
+        "postureTimeline": posture_data.get("timeline", []),
+        "gazeTimeline": posture_data.get("gaze_timeline", []),
+        "pauseLocations": audio_data.get("pauseLocations", []),
+        "disfluencies": audio_data.get("disfluencies", []),
+        "expressivenessTimeline": posture_data.get("expressiveness_timeline", []),
+        "expressiveness": round(
+            sum(x["score"] for x in posture_data.get("expressiveness_timeline", []))
+            / (len(posture_data.get("expressiveness_timeline", []) or [1])),
+            2,
+        ),
+        "emotion": emotion_data.get("dominant_emotion"),
+        "eyeGaze": posture_data.get("eyeGaze", 0.0),
+        "posture": posture_data.get("posture", 0.0),
+        "gestures": posture_data.get("gesture_count", 0),
+        "movement": posture_data.get("movement_energy", 0.0),
+        "speechFeatures": {
+            "rate": audio_data.get("words_per_minute", 0),
+            "volumeVariation": audio_data.get("volume_variation", 0.0),
+            "pitchVariation": audio_data.get("pitch_variation", 0.0),
+            "pauseCount": audio_data.get("pause_count", 0),
+            "fillerWords": audio_data.get("filler_words", {}),
+        },
+        "metrics": metrics,
+        "metricsConfidence": metrics_confidence,
+        "frameCost": {
+            "frames": frames.frames,
+            "sampling": frame_sampling or FRAME_SAMPLING,
+            "decodeMs": per_frame(frames.decode_ms),
+            "emotionMs": per_frame(emotions.elapsed_ms),
+            "emotionFps": emotions.throughput_fps,
+            "emotionBatches": emotions.batches,
+            "faceDetection": emotions.detection(),
+            "postureMs": per_frame(body_language.elapsed_ms),
+        },
+        "stageTimings": stage_timings,
+        "criticalPath": critical_path,
+        "videoPreparation": preparation,
+        "processingVersion": PROCESSING_VERSION,
+        "transcriptionProfile": (
+            transcription_profile or resolve_transcription_profile()
+        ).describe(),
+        "qualityFlag": "good",
+    }
+
+    return result
@@ -0,0 +1,125 @@
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+from core.config import (
+    PIN_QUESTION_WORKERS,
+    QUESTION_WORKER_THREADS,
+    QUESTION_WORKERS,
+    TRANSCRIPTION_MODE,
+    WARMUP_MODELS,
+)
+
+from .logger import get_logger
+
+logger = get_logger("question-pool")
+
+# Thread pools of the native runtimes: OpenMP (CTranslate2/Whisper), BLAS and
+# TensorFlow (DeepFace)
+_THREAD_ENV_VARS = (
+    "OMP_NUM_THREADS",
+    "MKL_NUM_THREADS",
+    "OPENBLAS_NUM_THREADS",
+    "TF_NUM_INTRAOP_THREADS",
+)
+# Model stages process_question runs at the same time: audio (CTranslate2),
+# emotion (TensorFlow) and posture (MediaPipe/TFLite)
+_CONCURRENT_STAGES = 3
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def _init_worker(counter, threads: int, pin: bool, warmup: bool):
+    """Cap native thread pools and pin to cores before any model is imported
+
+    The worker's threads are shared by the stages that run concurrently, so
+    each runtime gets its part rather than all of them. With warmup the worker
+    then loads its models, so they are warm by the time it picks up its first
+    question.
+    """
+    stage_threads = max(1, threads // _CONCURRENT_STAGES)
+    for var in _THREAD_ENV_VARS:
+        os.environ[var] = str(stage_threads)
+    os.environ["TF_NUM_INTEROP_THREADS"] = "1"
+
+    with counter.get_lock():
+        index = counter.value
+        counter.value += 1
+
+    if pin and hasattr(os, "sched_setaffinity"):
+        cpus = sorted(os.sched_getaffinity(0))
+        first = (index * threads) % len(cpus)
+        cores = {cpus[(first + i) % len(cpus)] for i in range(threads)}
+        os.sched_setaffinity(0, cores)
+        logger.info(f"Question worker {index} pinned to cores {sorted(cores)}")
+
+    if warmup:
+        from .helpers.model_registry import warmup_models
+
+        # Workers only need Whisper when they transcribe their own answer
+        warmup_models(whisper=TRANSCRIPTION_MODE == "per_question")
+
+
+def run_question(question: dict) -> dict:
+    """Pool entry point; models stay loaded in the worker between questions"""
+    # Imported here so the thread caps above apply before TF/CTranslate2 load
+    from .processor import process_question
+
+    return process_question(**question)
+
+
+def get_question_pool() -> Optional[ProcessPoolExecutor]:
+    """Shared process pool for per-question work, None when running inline"""
+    global _pool
+    if QUESTION_WORKERS <= 1:
+        return None
+    with _pool_lock:
+        if _pool is None:
+            threads = QUESTION_WORKER_THREADS or max(
+                1, (os.cpu_count() or 1) // QUESTION_WORKERS
+            )
+            # spawn, not fork: workers must not inherit the API's loaded models
+            # or thread pools
+            context = multiprocessing.get_context("spawn")
+            _pool = ProcessPoolExecutor(
+                max_workers=QUESTION_WORKERS,
+                mp_context=context,
+                initializer=_init_worker,
+                initargs=(
+                    context.Value("i", 0),
+                    threads,
+                    PIN_QUESTION_WORKERS,
+                    WARMUP_MODELS,
+                ),
+            )
+            logger.info(
+                f"Started question pool: {QUESTION_WORKERS} workers x "
+                f"{threads} threads"
+            )
+        return _pool
+
+
+def _ready() -> int:
+    return os.getpid()
+
+
+def start_question_pool() -> bool:
+    """Spawn every worker now instead of on the first questions, False if inline"""
+    pool = get_question_pool()
+    if pool is None:
+        return False
+    for _ in range(QUESTION_WORKERS):
+        pool.submit(_ready)
+    return True
+
+
+def reset_question_pool():
+    """Drop a broken pool (e.g. a worker was OOM-killed); the next call rebuilds"""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
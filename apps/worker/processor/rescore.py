@@ -0,0 +1,70 @@
+"""Recompute question metrics from stored analyzer features
+
+Reads the raw audio, emotion and posture outputs the pipeline saved in the
+feature store and runs only the scoring formulas, so a change to
+helpers/metrics.py can be applied to past interviews without decoding a
+video or loading a model.
+
+Usage (from apps/worker):
+    python -m processor.rescore [--interview ID ...] [--output results.jsonl]
+"""
+
+import argparse
+import json
+import sys
+import time
+
+from .feature_store import get_feature_store
+from .helpers.metrics import build_metrics
+from .logger import get_logger
+
+logger = get_logger("rescore")
+
+
+def rescore(interview_ids=None):
+    """(interview_id, question_id, metrics, metrics_confidence) per stored question"""
+    for interview_id, question_id, features in get_feature_store().iter_features(
+        interview_ids
+    ):
+        metrics, metrics_confidence = build_metrics(*features)
+        yield interview_id, question_id, metrics, metrics_confidence
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--interview",
+        action="append",
+        dest="interviews",
+        help="only rescore this interview (repeatable)",
+    )
+    parser.add_argument(
+        "--output", help="write JSON lines to this file instead of stdout"
+    )
+    args = parser.parse_args()
+
+    out = open(args.output, "w") if args.output else sys.stdout
+    start = time.perf_counter()
+    count = 0
+    try:
+        for interview_id, question_id, metrics, metrics_confidence in rescore(
+            args.interviews
+        ):
+            record = {
+                "interviewId": interview_id,
+                "questionId": question_id,
+                "metrics": metrics,
+                "metricsConfidence": metrics_confidence,
+            }
+            out.write(json.dumps(record) + "\n")
+            count += 1
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+    elapsed = time.perf_counter() - start
+    logger.info(f"Rescored {count} question(s) in {elapsed:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+
+# name -> (function, names of stages whose outputs it takes, in argument order)
+StageGraph = Dict[str, Tuple[Callable[..., Any], Sequence[str]]]
+
+
+def run_stages(
+    stages: StageGraph, max_workers: int = 4
+) -> Tuple[Dict[str, Any], Dict[str, Dict[str, float]], List[str]]:
+    """Run a small dependency graph of stages, each as soon as its inputs exist
+
+    Returns the stage outputs, per-stage timings (seconds relative to the
+    start of the graph) and the critical path: the chain of stages that
+    determined when the last stage finished. The first stage error is raised
+    once running stages have finished.
+    """
+    for name, (_, deps) in stages.items():
+        missing = [d for d in deps if d not in stages]
+        if missing:
+            raise ValueError(f"Stage '{name}' depends on unknown stages {missing}")
+
+    outputs: Dict[str, Any] = {}
+    timings: Dict[str, Dict[str, float]] = {}
+    origin = time.perf_counter()
+
+    def timed(name: str, fn: Callable[..., Any], args: List[Any]) -> Any:
+        start = time.perf_counter() - origin
+        try:
+            return fn(*args)
+        finally:
+            end = time.perf_counter() - origin
+            timings[name] = {
+                "start": round(start, 3),
+                "end": round(end, 3),
+                "seconds": round(end - start, 3),
+            }
+
+    pending = dict(stages)
+    running = {}
+    error = None
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        while pending or running:
+            if error is None:
+                ready = [
+                    name
+                    for name, (_, deps) in pending.items()
+                    if all(d in outputs for d in deps)
+                ]
+                for name in ready:
+                    fn, deps = pending.pop(name)
+                    args = [outputs[d] for d in deps]
+                    running[executor.submit(timed, name, fn, args)] = name
+            if not running:
+                if error is None and pending:
+                    raise ValueError(f"Stage graph has a cycle: {sorted(pending)}")
+                break
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                try:
+                    outputs[name] = future.result()
+                except Exception as e:
+                    if error is None:
+                        error = e
+            if error is not None:
+                pending.clear()
+
+    if error is not None:
+        raise error
+
+    return outputs, timings, _critical_path(stages, timings)
+
+
+def _critical_path(
+    stages: StageGraph, timings: Dict[str, Dict[str, float]]
+) -> List[str]:
+    if not timings:
+        return []
+    # Walk back from the last finishing stage that nothing else depends on
+    inputs = {d for _, deps in stages.values() for d in deps}
+    sinks = [n for n in timings if n not in inputs] or list(timings)
+    name = max(sinks, key=lambda n: timings[n]["end"])
+    path = [name]
+    while stages[name][1]:
+        # The input that arrived last is the one this stage was waiting on
+        name = max(stages[name][1], key=lambda d: timings[d]["end"])
+        path.append(name)
+    return list(reversed(path))
@@ -0,0 +1,222 @@
+import asyncio
+import itertools
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from core.config import JOB_JOURNAL_PATH, JOB_QUEUE_SIZE, JOB_WORKERS
+from processor.logger import get_logger
+from services.job_service import submit_processing_job
+
+logger = get_logger("job-queue")
+
+
+class JobQueueFull(Exception):
+    """Raised when a job is submitted while the queue is at capacity"""
+
+
+class JobJournal:
+    """SQLite record of every job so queued and running work survives restarts"""
+
+    def __init__(self, path: str):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS jobs (
+                interview_id TEXT PRIMARY KEY,
+                payload TEXT NOT NULL,
+                priority INTEGER NOT NULL,
+                seq INTEGER NOT NULL,
+                status TEXT NOT NULL,
+                submitted_at TEXT NOT NULL,
+                started_at TEXT,
+                finished_at TEXT,
+                error TEXT
+            )
+            """
+        )
+        self._conn.commit()
+
+    def upsert(self, interview_id: str, payload: dict, priority: int, seq: int) -> str:
+        submitted_at = datetime.now().isoformat()
+        with self._lock:
+            self._conn.execute(
+                """
+                INSERT OR REPLACE INTO jobs
+                    (interview_id, payload, priority, seq, status, submitted_at)
+                VALUES (?, ?, ?, ?, 'queued', ?)
+                """,
+                (interview_id, json.dumps(payload), priority, seq, submitted_at),
+            )
+            self._conn.commit()
+        return submitted_at
+
+    def mark(self, interview_id: str, status: str, error: Optional[str] = None):
+        column = "started_at" if status == "running" else "finished_at"
+        with self._lock:
+            self._conn.execute(
+                f"UPDATE jobs SET status = ?, {column} = ?, error = ? "
+                "WHERE interview_id = ?",
+                (status, datetime.now().isoformat(), error, interview_id),
+            )
+            self._conn.commit()
+
+    def get(self, interview_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT interview_id, priority, status, submitted_at, started_at, "
+                "finished_at, error FROM jobs WHERE interview_id = ?",
+                (interview_id,),
+            ).fetchone()
+        if row is None:
+            return None
+        keys = [
+            "interview_id",
+            "priority",
+            "status",
+            "submitted_at",
+            "started_at",
+            "finished_at",
+            "error",
+        ]
+        return dict(zip(keys, row))
+
+    def unfinished(self) -> List[Tuple[str, dict, int, int]]:
+        """Queued and interrupted jobs in their original submission order"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT interview_id, payload, priority, seq FROM jobs "
+                "WHERE status IN ('queued', 'running') ORDER BY seq"
+            ).fetchall()
+        return [(i, json.loads(p), pr, s) for i, p, pr, s in rows]
+
+    def max_seq(self) -> int:
+        with self._lock:
+            row = self._conn.execute("SELECT MAX(seq) FROM jobs").fetchone()
+        return row[0] or 0
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class JobScheduler:
+    """Bounded priority queue of interview jobs drained by a fixed worker pool
+
+    Higher priority runs first; equal priorities run in submission order.
+    """
+
+    def __init__(
+        self,
+        workers: int = JOB_WORKERS,
+        max_queue: int = JOB_QUEUE_SIZE,
+        journal_path: str = JOB_JOURNAL_PATH,
+    ):
+        self.workers = workers
+        self.max_queue = max_queue
+        self.journal_path = journal_path
+        self.journal: Optional[JobJournal] = None
+        self._queue: Optional[asyncio.PriorityQueue] = None
+        self._pending: Dict[str, Tuple[int, int]] = {}
+        self._running: Dict[str, datetime] = {}
+        self._tasks: List[asyncio.Task] = []
+        self._seq = itertools.count()
+
+    @property
+    def running(self) -> bool:
+        return bool(self._tasks)
+
+    async def start(self):
+        self.journal = JobJournal(self.journal_path)
+        self._queue = asyncio.PriorityQueue()
+        self._seq = itertools.count(self.journal.max_seq() + 1)
+
+        # Jobs that were running when the process died are queued again
+        recovered = self.journal.unfinished()
+        for interview_id, payload, priority, seq in recovered:
+            self._enqueue(interview_id, payload, priority, seq)
+        if recovered:
+            logger.info(f"Recovered {len(recovered)} job(s) from journal")
+
+        self._tasks = [
+            asyncio.create_task(self._worker(i)) for i in range(self.workers)
+        ]
+        logger.info(
+            f"Job scheduler started with {self.workers} worker(s), "
+            f"queue size {self.max_queue}"
+        )
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        if self.journal:
+            self.journal.close()
+            self.journal = None
+
+    def _enqueue(self, interview_id: str, payload: dict, priority: int, seq: int):
+        self._pending[interview_id] = (-priority, seq)
+        self._queue.put_nowait((-priority, seq, interview_id, payload))
+
+    def submit(self, interview_id: str, payload: dict, priority: int = 0) -> dict:
+        """Queue a job, or return the existing one if it is already queued/running"""
+        if interview_id in self._pending or interview_id in self._running:
+            return self.status(interview_id)
+        if len(self._pending) >= self.max_queue:
+            raise JobQueueFull(f"Job queue is full ({self.max_queue} jobs)")
+
+        seq = next(self._seq)
+        self.journal.upsert(interview_id, payload, priority, seq)
+        self._enqueue(interview_id, payload, priority, seq)
+        logger.info(f"Queued job {interview_id} with priority {priority}")
+        return self.status(interview_id)
+
+    def queue_position(self, interview_id: str) -> Optional[int]:
+        """1-based position among queued jobs, None if the job is not queued"""
+        key = self._pending.get(interview_id)
+        if key is None:
+            return None
+        return 1 + sum(1 for other in self._pending.values() if other < key)
+
+    def status(self, interview_id: str) -> Optional[dict]:
+        job = self.journal.get(interview_id) if self.journal else None
+        if job is None:
+            return None
+        job["queue_position"] = self.queue_position(interview_id)
+        job["queue_length"] = len(self._pending)
+        job["running_jobs"] = len(self._running)
+        return job
+
+    async def _worker(self, worker_index: int):
+        while True:
+            _, seq, interview_id, payload = await self._queue.get()
+            if self._pending.get(interview_id, (None, None))[1] != seq:
+                # Stale entry for a job that was re-submitted
+                self._queue.task_done()
+                continue
+            del self._pending[interview_id]
+            self._running[interview_id] = datetime.now()
+            self.journal.mark(interview_id, "running")
+            try:
+                logger.info(f"Worker {worker_index} picked up job {interview_id}")
+                await submit_processing_job(**payload)
+                self.journal.mark(interview_id, "completed")
+            except asyncio.CancelledError:
+                # Leave the job as running so it is recovered on next start
+                raise
+            except Exception as e:
+                logger.error(f"Job {interview_id} failed: {str(e)}")
+                self.journal.mark(interview_id, "failed", str(e))
+            finally:
+                self._running.pop(interview_id, None)
+                self._queue.task_done()
+
+
+scheduler = JobScheduler()
@@ -1,8 +1,10 @@
+import asyncio
 from datetime import datetime, timezone
 
 import httpx
 from processor.logger import get_logger
 from processor.processor import process_interview
+from services.result_cache import interview_cache_key, result_cache
 
 logger = get_logger("job-service")
 
@@ -70,6 +72,38 @@ async def notify_worker_status(
         logger.error(f"Worker status update failed for job {interview_id}: {str(e)}")
 
 
+async def process_interview_cached(
+    interview_id: str,
+    video_url: str,
+    timestamps: list,
+    questions: dict,
+    options: dict,
+):
+    """process_interview, reusing results of an identical earlier submission"""
+
+    def compute():
+        return process_interview(
+            interview_id,
+            {
+                "videoUrl": video_url,
+                "timestamps": timestamps,
+                "questions": questions,
+                "options": options,
+            },
+        )
+
+    if result_cache is None:
+        return await compute()
+    loop = asyncio.get_running_loop()
+    key = await loop.run_in_executor(
+        None, interview_cache_key, video_url, timestamps, options
+    )
+    if key is None:
+        logger.info(f"Video of job {interview_id} cannot be fingerprinted, not caching")
+        return await compute()
+    return await result_cache.get_or_compute(key, compute)
+
+
 async def submit_processing_job(
     interview_id: str,
     video_url: str,
@@ -79,16 +113,23 @@ async def submit_processing_job(
     status_callback_url: str,
     task_status_callback_url: str,
     worker_status_callback_url: str,
+    options: dict = None,
 ):
     try:
         logger.info(f"Processing job {interview_id}")
         await notify_status(status_callback_url, interview_id, "processing")
         await notify_task_status(task_status_callback_url, interview_id, "PROCESSING")
         await notify_worker_status(worker_status_callback_url, interview_id, "BUSY")
-        interview_result = await process_interview(
-            interview_id,
-            {"videoUrl": video_url, "timestamps": timestamps, "questions": questions},
+        interview_result = await process_interview_cached(
+            interview_id, video_url, timestamps, questions, options or {}
         )
+        # run_interview_pipeline reports failures (download, ffmpeg, ...) as a
+        # result instead of raising; fail the job so it is journaled as failed
+        if (
+            isinstance(interview_result, dict)
+            and interview_result.get("status") == "error"
+        ):
+            raise Exception(interview_result.get("message") or "Processing failed")
         logger.info(f"Completed job {interview_id}")
         # print(interview_result)
         # if callback_url:
@@ -114,3 +155,4 @@ async def submit_processing_job(
             worker_status_callback_url, interview_id, "AVAILABLE"
         )
         logger.error(f"Error processing job {interview_id}: {str(e)}")
+        raise
@@ -0,0 +1,238 @@
+import asyncio
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from core.config import (
+    INGEST_TIMEOUT_SECONDS,
+    RESULT_CACHE_DIR,
+    RESULT_CACHE_ENABLED,
+    RESULT_CACHE_MAX_AGE_SECONDS,
+    RESULT_CACHE_MAX_MB,
+)
+from processor.helpers.ingest import get_session
+from processor.logger import get_logger
+from processor.processor import PROCESSING_VERSION
+
+logger = get_logger("result-cache")
+
+
+def video_fingerprint(video_url: str) -> Optional[str]:
+    """Identity of a recording's content without downloading it, if possible
+
+    Local files are hashed; remote ones use the ETag (with the length) from a
+    HEAD request, falling back to Last-Modified. None means the content cannot
+    be identified up front and the result should not be cached.
+    """
+    if os.path.exists(video_url):
+        digest = hashlib.sha256()
+        with open(video_url, "rb") as f:
+            for block in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(block)
+        return f"sha256:{digest.hexdigest()}"
+
+    try:
+        response = get_session().head(
+            video_url, allow_redirects=True, timeout=INGEST_TIMEOUT_SECONDS
+        )
+        response.raise_for_status()
+    except Exception as e:
+        logger.info(f"Could not fingerprint {video_url}: {str(e)}")
+        return None
+    length = response.headers.get("Content-Length", "")
+    etag = response.headers.get("ETag")
+    if etag:
+        return f"etag:{etag}:{length}"
+    last_modified = response.headers.get("Last-Modified")
+    if last_modified:
+        return f"url:{response.url}:{last_modified}:{length}"
+    return None
+
+
+def interview_cache_key(
+    video_url: str, timestamps: List[dict], options: Optional[dict] = None
+) -> Optional[str]:
+    """Cache key of an interview's results, None if the video is unidentifiable"""
+    fingerprint = video_fingerprint(video_url)
+    if fingerprint is None:
+        return None
+    material = json.dumps(
+        {
+            "video": fingerprint,
+            "timestamps": timestamps,
+            "options": options or {},
+            "version": PROCESSING_VERSION,
+        },
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(material.encode()).hexdigest()
+
+
+def is_cacheable(result: Any) -> bool:
+    """Only complete results are kept; errors and partial answers are retried"""
+    return isinstance(result, list) and not any(
+        isinstance(item, dict) and "error" in item for item in result
+    )
+
+
+class ResultCache:
+    """Interview results on disk, one JSON file per key, evicted by size and age
+
+    Concurrent requests for a key that is being computed wait for that one
+    computation instead of starting their own. The directory is created on
+    first write; if that fails the cache disables itself rather than failing
+    jobs.
+    """
+
+    def __init__(
+        self,
+        directory: str = RESULT_CACHE_DIR,
+        max_mb: float = RESULT_CACHE_MAX_MB,
+        max_age_seconds: float = RESULT_CACHE_MAX_AGE_SECONDS,
+    ):
+        self.directory = directory
+        self.max_bytes = max_mb * 1024 * 1024
+        self.max_age_seconds = max_age_seconds
+        self._lock = threading.Lock()
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.hits = 0
+        self.misses = 0
+        self.shared = 0
+        self.enabled = True
+        self._directory_ready = False
+
+    def _ensure_directory(self) -> bool:
+        if self.enabled and not self._directory_ready:
+            try:
+                os.makedirs(self.directory, exist_ok=True)
+                self._directory_ready = True
+            except OSError as e:
+                self.enabled = False
+                logger.error(
+                    f"Cannot create result cache directory {self.directory}, "
+                    f"disabling the cache: {str(e)}"
+                )
+        return self.enabled
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def _expired(self, mtime: float, now: float) -> bool:
+        return self.max_age_seconds > 0 and now - mtime > self.max_age_seconds
+
+    def get(self, key: str) -> Optional[Any]:
+        path = self._path(key)
+        with self._lock:
+            try:
+                if self._expired(os.path.getmtime(path), time.time()):
+                    os.unlink(path)
+                    return None
+                with open(path) as f:
+                    result = json.load(f)
+                # Touch, so eviction by size drops the least recently used first
+                os.utime(path)
+                return result
+            except (OSError, ValueError):
+                return None
+
+    def put(self, key: str, result: Any) -> None:
+        path = self._path(key)
+        temp_path = f"{path}.tmp"
+        with self._lock:
+            if not self._ensure_directory():
+                return
+            with open(temp_path, "w") as f:
+                json.dump(result, f)
+            os.replace(temp_path, path)
+            self._evict()
+
+    def _evict(self) -> None:
+        now = time.time()
+        entries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(".json"):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            if self._expired(stat.st_mtime, now):
+                os.unlink(path)
+            else:
+                entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        if self.max_bytes <= 0 or total <= self.max_bytes:
+            return
+        for _, size, path in sorted(entries):
+            os.unlink(path)
+            total -= size
+            logger.info(f"Evicted cached result {os.path.basename(path)}")
+            if total <= self.max_bytes:
+                break
+
+    async def get_or_compute(
+        self, key: str, compute: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """Cached result for key, or compute it once however many callers wait"""
+        if not self.enabled:
+            return await compute()
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self.shared += 1
+            logger.info(f"Waiting for in-flight computation of {key[:12]}")
+            return await asyncio.shield(inflight)
+
+        loop = asyncio.get_running_loop()
+        cached = await loop.run_in_executor(None, self.get, key)
+        if cached is not None:
+            self.hits += 1
+            logger.info(f"Result cache hit for {key[:12]}")
+            return cached
+
+        # Re-check: another caller may have started while we read the disk
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self.shared += 1
+            return await asyncio.shield(inflight)
+
+        self.misses += 1
+        future = loop.create_future()
+        self._inflight[key] = future
+        try:
+            result = await compute()
+            if is_cacheable(result):
+                try:
+                    await loop.run_in_executor(None, self.put, key, result)
+                except Exception as e:
+                    # The result is fine; only caching it failed (e.g. disk full)
+                    logger.error(f"Failed to cache result {key[:12]}: {str(e)}")
+            future.set_result(result)
+            return result
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Nobody else may be waiting; do not warn about an unretrieved error
+            future.exception()
+            raise
+        finally:
+            del self._inflight[key]
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "hits": self.hits,
+            "misses": self.misses,
+            "shared": self.shared,
+            "inflight": len(self._inflight),
+        }
+
+
+result_cache = ResultCache() if RESULT_CACHE_ENABLED else None
@@ -0,0 +1,84 @@
+import asyncio
+import time
+
+import httpx
+import processor.processor as pipeline
+import services.job_service as job_service
+from api.main import app
+from services.job_queue import scheduler
+
+JOB_SECONDS = 1.5
+# GET / must answer within this while the job runs
+MAX_LATENCY_SECONDS = 0.25
+
+PAYLOAD = {
+    "interview_id": "latency-test",
+    "video_url": "http://example.invalid/video.mp4",
+    "timestamps": [],
+    "questions": {},
+    "callback_url": "http://example.invalid/callback",
+    "status_callback_url": "http://example.invalid/status",
+    "task_status_callback_url": "http://example.invalid/task-status",
+    "worker_status_callback_url": "http://example.invalid/worker-status",
+}
+
+
+def blocking_pipeline(interview_id, metadata):
+    # Stands in for ffmpeg, Whisper and the vision models, which all block
+    time.sleep(JOB_SECONDS)
+    return []
+
+
+async def notify(*args, **kwargs):
+    pass
+
+
+async def measure_root_latency():
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.post("/process-interview", json=PAYLOAD)
+        assert response.status_code == 200
+
+        latencies = []
+        statuses = set()
+        deadline = time.perf_counter() + JOB_SECONDS * 4
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            response = await client.get("/")
+            latencies.append(time.perf_counter() - start)
+            assert response.status_code == 200
+
+            job = (await client.get(f"/jobs/{PAYLOAD['interview_id']}")).json()
+            statuses.add(job["status"])
+            if job["status"] in ("completed", "failed"):
+                break
+            await asyncio.sleep(0.05)
+        return latencies, job["status"], statuses
+
+
+def test_root_answers_while_job_runs(monkeypatch, tmp_path):
+    monkeypatch.setattr(pipeline, "run_interview_pipeline", blocking_pipeline)
+    monkeypatch.setattr(job_service, "result_cache", None)
+    for name in (
+        "notify_status",
+        "notify_callback",
+        "notify_task_status",
+        "notify_worker_status",
+    ):
+        monkeypatch.setattr(job_service, name, notify)
+    monkeypatch.setattr(scheduler, "journal_path", str(tmp_path / "jobs.sqlite3"))
+
+    async def run():
+        # ASGITransport does not send lifespan events, so start the scheduler here
+        await scheduler.start()
+        try:
+            return await measure_root_latency()
+        finally:
+            await scheduler.stop()
+
+    latencies, status, statuses = asyncio.run(run())
+
+    assert "running" in statuses
+    assert status == "completed"
+    assert len(latencies) > 5
+    assert max(latencies) < MAX_LATENCY_SECONDS
@@ -0,0 +1,46 @@
+import asyncio
+
+import httpx
+import pytest
+from api.main import app
+from services.job_queue import scheduler
+
+PAYLOAD = {
+    "interview_id": "invalid-options",
+    "video_url": "http://example.invalid/video.mp4",
+    "timestamps": [],
+    "questions": {},
+}
+
+
+@pytest.mark.parametrize(
+    "options",
+    [
+        {"whisperProfile": "no-such-profile"},
+        {"whisper": {"temperature": 0.5}},
+        {"whisper": {"cpuThreads": 3}},
+        {"whisper": {"beamSize": "wide"}},
+    ],
+)
+def test_invalid_transcription_options_are_rejected(monkeypatch, tmp_path, options):
+    monkeypatch.setattr(scheduler, "journal_path", str(tmp_path / "jobs.sqlite3"))
+
+    async def run():
+        await scheduler.start()
+        try:
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(
+                transport=transport, base_url="http://test"
+            ) as client:
+                response = await client.post(
+                    "/process-interview", json={**PAYLOAD, "options": options}
+                )
+                job = await client.get(f"/jobs/{PAYLOAD['interview_id']}")
+            return response, job
+        finally:
+            await scheduler.stop()
+
+    response, job = asyncio.run(run())
+
+    assert response.status_code == 422
+    assert job.status_code == 404
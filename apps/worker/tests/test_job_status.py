@@ -0,0 +1,53 @@
+import asyncio
+
+import processor.processor as pipeline
+import services.job_service as job_service
+from services.job_queue import JobScheduler
+
+PAYLOAD = {
+    "interview_id": "failing-job",
+    "video_url": "http://example.invalid/video.mp4",
+    "timestamps": [],
+    "questions": {},
+    "callback_url": "http://example.invalid/callback",
+    "status_callback_url": "http://example.invalid/status",
+    "task_status_callback_url": "http://example.invalid/task-status",
+    "worker_status_callback_url": "http://example.invalid/worker-status",
+}
+
+
+def failing_pipeline(interview_id, metadata):
+    # What run_interview_pipeline returns when e.g. the download fails
+    return {"status": "error", "message": "ffmpeg failed", "interviewId": interview_id}
+
+
+def test_pipeline_error_result_marks_job_failed(monkeypatch, tmp_path):
+    task_statuses = []
+
+    async def notify(*args, **kwargs):
+        pass
+
+    async def notify_task_status(url, interview_id, status):
+        task_statuses.append(status)
+
+    monkeypatch.setattr(pipeline, "run_interview_pipeline", failing_pipeline)
+    monkeypatch.setattr(job_service, "result_cache", None)
+    for name in ("notify_status", "notify_callback", "notify_worker_status"):
+        monkeypatch.setattr(job_service, name, notify)
+    monkeypatch.setattr(job_service, "notify_task_status", notify_task_status)
+
+    async def run():
+        scheduler = JobScheduler(journal_path=str(tmp_path / "jobs.sqlite3"))
+        await scheduler.start()
+        try:
+            scheduler.submit(PAYLOAD["interview_id"], PAYLOAD)
+            await scheduler._queue.join()
+            return scheduler.status(PAYLOAD["interview_id"])
+        finally:
+            await scheduler.stop()
+
+    job = asyncio.run(run())
+
+    assert job["status"] == "failed"
+    assert job["error"] == "ffmpeg failed"
+    assert task_statuses == ["PROCESSING", "FAILED_PROCESSING"]